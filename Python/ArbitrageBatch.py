@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import sys
+from functools import partial
+from multiprocessing import Pool
+
+ENGINES = ['graph', 'dict', 'vector', 'triangle', 'mean']
+INPUT_EXTENSIONS = ('.txt', '.json')
+
+
+def read_matrix_file(path):
+    """
+    Read a rate matrix from a file.
+
+    Text files use the same format as the GUI's custom matrix input:
+
+        3, A, B, C
+        1 0.651 0.581
+        1.531 1 0.952
+        1.711 1.049 1
+
+    JSON files hold a nested dictionary, from_currency -> {to_currency: rate}, like exchange_rates.
+
+    Returns:
+        tuple: The list of currencies and the matrix as a list of rows, with NaN for missing rates.
+    """
+    if path.endswith('.json'):
+        with open(path) as file:
+            rates = json.load(file)
+        if not isinstance(rates, dict) or not all(isinstance(row, dict) for row in rates.values()):
+            raise ValueError("Expected a nested dictionary, from_currency -> {to_currency: rate}")
+        currencies = list(rates)
+        matrix = [[1.0 if i == j else json_rate(rates[from_currency], to_currency)
+                   for j, to_currency in enumerate(currencies)]
+                  for i, from_currency in enumerate(currencies)]
+        return currencies, matrix
+
+    with open(path) as file:
+        lines = [line for line in file.read().strip().split('\n') if line.strip()]
+
+    # First line is the number of rows/columns, followed by the labels
+    header = [field.strip() for field in lines[0].split(',')]
+    n = int(header[0])
+    currencies = header[1:]
+    if len(currencies) != n:
+        raise ValueError("Number of labels does not match the number of columns")
+
+    matrix = [list(map(float, line.split())) for line in lines[1:n + 1]]
+    if len(matrix) != n or any(len(row) != n for row in matrix):
+        raise ValueError(f"Expected a {n} x {n} matrix")
+    return currencies, matrix
+
+
+def json_rate(row, currency):
+    # A missing rate is NaN; anything but a number or a numeric string is an error
+    rate = row.get(currency, 'nan')
+    if isinstance(rate, bool) or not isinstance(rate, (int, float, str)):
+        raise ValueError(f"Invalid rate to {currency}: {rate!r}")
+    return float(rate)
+
+
+def find_inputs(paths):
+    """
+    Expand files and directories into the list of input files, in a stable order.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(INPUT_EXTENSIONS):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def cycle_gain(cycle, matrix, precision=28):
+    # Product of the rates around the cycle, minus 1, verified from the raw rates (see Cycles.exact_gain)
+    from Cycles import exact_gain
+    return exact_gain((matrix[cycle[i]][cycle[i + 1]] for i in range(len(cycle) - 1)), precision)
+
+
+def detect(currencies, matrix, engine, top):
+    """
+    Run one arbitrage engine over a matrix.
+
+    Returns:
+        list: Arbitrage cycles as lists of currency indices, at most 'top' of them, best first
+              for the engines that rank cycles.
+    """
+    if engine == 'graph':
+        from CurrencyExchangeMerged import build_graph
+        graph = build_graph(currencies, matrix)
+        cycles = [list(cycle) for cycle, _ in graph.top_arbitrages_by_component(top)]
+
+    elif engine == 'dict':
+        from BellmanFord import BellmanFord, Exchange
+        from Components import strongly_connected_components
+        from Cycles import top_k_cycles
+        from RateGraph import edge_arrays
+
+        # One run per strongly connected component, so every cycle is reachable from the run's source
+        sources, destinations, weights = edge_arrays(matrix)
+        sources, destinations, weights = sources.tolist(), destinations.tolist(), weights.tolist()
+        component_of = {}
+        for c, component in enumerate(strongly_connected_components(len(currencies), zip(sources, destinations))):
+            for vertex in component:
+                component_of[vertex] = c
+        edges = {}
+        for u, v, w in zip(sources, destinations, weights):
+            if component_of[u] == component_of[v]:
+                edges.setdefault(component_of[u], []).append((u, v, w))
+
+        def candidates():
+            for component_edges in edges.values():
+                yield from BellmanFord(Exchange()).top_arbitrages(component_edges, component_edges[0][0], top)
+
+        cycles = [list(cycle) for cycle, _ in top_k_cycles(candidates(), top)]
+
+    elif engine == 'triangle':
+        from TriangleScan import scan_triangles
+        triangles, _ = scan_triangles(matrix)
+        cycles = [[i, j, k, i] for i, j, k in triangles[:top].tolist()]
+
+    elif engine == 'mean':
+        from MeanCycle import min_mean_cycle
+        cycle, mean_log_gain = min_mean_cycle(matrix)
+        cycles = [cycle] if mean_log_gain > 0 else []
+
+    else:
+        import numpy as np
+        from Detector import Detector
+        detector = Detector(list(range(len(currencies))))
+        cycles = [detector.arbitrage] if detector.run(np.array(matrix, dtype=float)) else []
+
+    return cycles[:top]
+
+
+def process_file(path, engine, top, precision=28):
+    """
+    Detect arbitrage in one input file. Errors are reported in the record instead of stopping the batch.
+    """
+    record = {'input': path, 'engine': engine}
+    try:
+        currencies, matrix = read_matrix_file(path)
+        cycles = detect(currencies, matrix, engine, top)
+    except (OSError, ValueError, KeyError, IndexError) as e:
+        record['error'] = str(e)
+        return record
+
+    # The engines work in floats, only keep the candidates that are profitable at full precision
+    gains = [cycle_gain(cycle, matrix, precision) for cycle in cycles]
+    record['currencies'] = currencies
+    record['cycles'] = [{'path': [currencies[i] for i in cycle], 'gain': float(gain)}
+                        for cycle, gain in zip(cycles, gains) if gain > 0]
+    record['arbitrage'] = bool(record['cycles'])
+    record['rejected'] = len(cycles) - len(record['cycles'])
+    return record
+
+
+def format_record(record, output_format):
+    if output_format == 'jsonl':
+        return json.dumps(record)
+
+    if 'error' in record:
+        return f"{record['input']}: error: {record['error']}"
+    if not record['arbitrage']:
+        return f"{record['input']}: No arbitrage opportunities found."
+    return '\n'.join(f"{record['input']}: Arbitrage detected! Currency sequence: {' -> '.join(cycle['path'])}"
+                     f" (gain {cycle['gain'] * 100:.2f}%)" for cycle in record['cycles'])
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {value}")
+    return number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Detect arbitrage in exchange rate matrices without prompts.")
+    parser.add_argument('inputs', nargs='+', help="Matrix files (.txt or .json) or directories containing them")
+    parser.add_argument('--engine', choices=ENGINES, default='graph', help="Detection engine (default: graph)")
+    parser.add_argument('--format', choices=['jsonl', 'text'], default='jsonl', help="Output format (default: jsonl)")
+    parser.add_argument('--output', '-o', help="Write results to this file instead of stdout")
+    parser.add_argument('--top', type=non_negative_int, default=5, help="Maximum number of cycles to report per input")
+    parser.add_argument('--precision', type=non_negative_int, default=28,
+                        help="Significant digits used to verify cycle gains, 0 for exact fractions (default: 28)")
+    parser.add_argument('--workers', type=int, default=1, help="Number of worker processes (default: 1)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = find_inputs(args.inputs)
+    worker = partial(process_file, engine=args.engine, top=args.top, precision=args.precision or None)
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    pool = Pool(args.workers) if args.workers > 1 else None
+    failures = 0
+    try:
+        # Results are streamed in input order as soon as they are ready
+        results = pool.imap(worker, paths, chunksize=16) if pool else map(worker, paths)
+        for record in results:
+            failures += 'error' in record
+            print(format_record(record, args.format), file=output, flush=True)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        if output is not sys.stdout:
+            output.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
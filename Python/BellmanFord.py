@@ -1,5 +1,6 @@
 import math
-import tkinter as tk
+
+from Cycles import top_k_cycles
 
 
 class Exchange:
@@ -14,7 +15,7 @@ class BellmanFord:
     def __init__(self, ex):
         self.ex = ex
 
-    def find_arbitrage_and_shortest_path(self, edges, rates, start_currency, end_currency):
+    def _relax(self, edges, start_currency):
         # Extract all unique nodes
         nodes = set(u for u, _, _ in edges).union(v for _, v, _ in edges)
         distance = {node: self.INF for node in nodes}
@@ -28,6 +29,58 @@ class BellmanFord:
                     distance[v] = round(distance[u] + w, 3)
                     predecessor[v] = u
 
+        return nodes, distance, predecessor
+
+    def _trace_cycle(self, predecessor, cycle_start, no_nodes):
+        cycle = []
+        current = cycle_start
+
+        # Find the cycle starting point, or give up if the walk leads back to the source instead
+        for _ in range(no_nodes):
+            current = predecessor[current]
+            if current is None:
+                return []
+
+        cycle_start = current
+
+        # Trace back to find the complete cycle
+        while True:
+            cycle.append(current)
+            current = predecessor[current]
+            if current == cycle_start:
+                cycle.append(current)
+                break
+        cycle.reverse()
+        return cycle
+
+    def top_arbitrages(self, edges, start_currency, k):
+        """
+        Rank the arbitrage cycles reachable from start_currency, most profitable first.
+
+        Every edge that can still be relaxed after |V| - 1 passes is traced back to its cycle,
+        rather than stopping at the first one.
+
+        Returns:
+            generator: Up to k (cycle, log_gain) pairs, where log_gain is the negated cycle weight
+                       in the same logarithm base as the edge weights.
+        """
+        nodes, distance, predecessor = self._relax(edges, start_currency)
+        weights = {(u, v): w for u, v, w in edges}
+
+        def candidates():
+            for u, v, w in edges:
+                if round(distance[u] + w, 3) < round(distance[v], 3):
+                    predecessor[v] = u # Apply the pending relaxation so the walk from v goes through u
+                    cycle = self._trace_cycle(predecessor, v, len(nodes))
+                    if not cycle:
+                        continue
+                    yield cycle, -sum(weights[(cycle[i], cycle[i + 1])] for i in range(len(cycle) - 1))
+
+        return top_k_cycles(candidates(), k)
+
+    def find_arbitrage_and_shortest_path(self, edges, rates, start_currency, end_currency):
+        nodes, distance, predecessor = self._relax(edges, start_currency)
+
         # Check for negative weight cycles
         arbitrage_found = False
         cycle_start = None
@@ -40,23 +93,7 @@ class BellmanFord:
 
         if arbitrage_found:
             # If there is an arbitrage, trace the path using predecessors
-            cycle = []
-            current = cycle_start
-
-            # Find the cycle starting point
-            for _ in range(len(nodes)):
-                current = predecessor[current]
-
-            cycle_start = current
-
-            # Trace back to find the complete cycle
-            while True:
-                cycle.append(current)
-                current = predecessor[current]
-                if current == cycle_start:
-                    cycle.append(current)
-                    break
-            cycle.reverse()
+            cycle = self._trace_cycle(predecessor, cycle_start, len(nodes))
 
             # Calculate the gain product
             gain_product = 1.0
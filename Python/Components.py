@@ -0,0 +1,119 @@
+def strongly_connected_components(no_vertices, edges):
+    """
+    Split a graph into strongly connected components with an iterative version of Tarjan's algorithm.
+
+    A cycle never leaves its component, so arbitrage detection can run on each component on its own.
+
+    Args:
+        no_vertices (int): Number of vertices, numbered 0..no_vertices - 1.
+        edges (iterable): (start, destination) pairs.
+
+    Returns:
+        list: Components as lists of vertex numbers, in reverse topological order.
+    """
+    adjacency = [[] for _ in range(no_vertices)]
+    for start, destination in edges:
+        adjacency[start].append(destination)
+
+    index = [-1] * no_vertices  # Order in which vertices were first visited
+    low = [0] * no_vertices     # Smallest index reachable from the vertex's subtree
+    on_stack = [False] * no_vertices
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(no_vertices):
+        if index[root] != -1:
+            continue
+
+        # Each frame is (vertex, position of the next neighbour to visit), instead of recursion
+        work = [(root, 0)]
+        while work:
+            vertex, position = work.pop()
+            if position == 0:
+                index[vertex] = low[vertex] = counter
+                counter += 1
+                stack.append(vertex)
+                on_stack[vertex] = True
+
+            neighbours = adjacency[vertex]
+            while position < len(neighbours):
+                neighbour = neighbours[position]
+                position += 1
+                if index[neighbour] == -1:
+                    # Come back to this vertex once the neighbour is done
+                    work.append((vertex, position))
+                    work.append((neighbour, 0))
+                    break
+                if on_stack[neighbour]:
+                    low[vertex] = min(low[vertex], index[neighbour])
+            else:
+                # All neighbours done: close the component if this vertex is its root
+                if low[vertex] == index[vertex]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == vertex:
+                            break
+                    components.append(component)
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[vertex])
+
+    return components
+
+
+# Example usage: a chain of two cycles and a dead end, then detection on a clustered quote book
+if __name__ == "__main__":
+    import math
+    import random
+    import time
+    from multiprocessing import Pool
+
+    from CurrencyExchangeMerged import Graph
+
+    edges = [(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 3), (4, 5)]
+    components = strongly_connected_components(6, edges)
+    print(components)
+    assert sorted(map(sorted, components)) == [[0, 1, 2], [3, 4], [5]]
+
+    # Deep graphs don't hit the recursion limit
+    n = 100000
+    chain = [(i, i + 1) for i in range(n - 1)] + [(n - 1, 0)]
+    assert len(strongly_connected_components(n, chain)) == 1
+
+    # Regional clusters quoted among themselves, linked one way to the next cluster
+    random.seed(0)
+    clusters, size = 8, 25
+    graph = Graph(clusters * size)
+    for c in range(clusters):
+        members = range(c * size, (c + 1) * size)
+        value = {v: random.uniform(0.5, 150) for v in members}
+        for u in members:
+            for v in members:
+                if u != v:
+                    graph.add_edge(u, v, -math.log10(value[v] / value[u] * 0.999))
+        if c + 1 < clusters:
+            graph.add_edge(c * size, (c + 1) * size, 0.0)
+    graph.set_edge(3 * size + 2, 3 * size + 1, -math.log10(2.0))  # One arbitrage in the fourth cluster
+
+    start = time.perf_counter()
+    whole = Graph(graph.no_vertices)
+    whole.edges = graph.edges
+    found, arbitrages = whole.bellman_ford(0)
+    whole_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found_by_component, by_component = graph.bellman_ford_by_component()
+    component_time = time.perf_counter() - start
+
+    with Pool(4) as pool:
+        start = time.perf_counter()
+        graph.bellman_ford_by_component(pool)
+        pool_time = time.perf_counter() - start
+
+    assert found and found_by_component and set(arbitrages) == set(by_component)
+    print(f"{clusters} clusters of {size}: whole graph {whole_time * 1000:.0f} ms, "
+          f"per component {component_time * 1000:.0f} ms, per component on 4 processes {pool_time * 1000:.0f} ms")
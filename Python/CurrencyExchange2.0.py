@@ -1,10 +1,25 @@
+import math
+import os
 import tkinter as tk
 from tkinter import messagebox, ttk
-import requests
-import numpy as np
 
-# Global dictionary to store exchange rates
-exchange_rates = {}
+from CurrencyUniverse import CurrencyUniverse
+from ExchangeCore import BellmanFord, Labels, create_graph_from_rates, fetch_exchange_rates, rates_changed
+from HopPaths import HopLimitedPaths
+from MatrixCanvas import MatrixView
+from RateService import ServiceClient
+from SharedRates import RateSubscriber
+from Snapshots import SnapshotHolder
+
+# Shared rate service (see RateService.py), used instead of fetching and detecting in every window when configured
+rate_service = ServiceClient(os.environ['RATE_SERVICE_URL']) if 'RATE_SERVICE_URL' in os.environ else None
+rates_from_service = False
+
+# Rates published in shared memory by a local RateService (--shm), read instead of fetching when configured
+shared_rates = RateSubscriber(os.environ['RATE_SHM_NAME']) if 'RATE_SHM_NAME' in os.environ else None
+
+# Largest number of conversions shown in the best rate trade-off
+MAX_HOPS = 3
 
 # Static dictionaries for exchange rates with no arbitrage (direct and indirect)
 exchange_rates_no_arbitrage_direct = {
@@ -23,245 +38,114 @@ exchange_rates_no_arbitrage_indirect = {
     'E': {'A': 1, 'B': 1, 'C': 1, 'D': 1}
 }
 
-class Labels:
-    """ Class to store and manage label texts."""
-    def __init__(self):
-        self.path_info = "" # Best path label
-        self.arbitrage_info = "" # Arbitrage path and percentage gain label
-
-class BellmanFord:
-    """ Class to find arbitrage opportunities and shortest paths using the Bellman-Ford algorithm"""
-    INF = float('inf')
-
-    def __init__(self, ex):
-        self.ex = ex
-
-    def find_arbitrage_and_shortest_path(self, edges, start_currency, end_currency):
-        """
-        Find arbitrage opportunities and the shortest path between two currencies.
-
-        Args:
-            edges (list of tuples): List of edges in the form (from_currency, to_currency, rate).
-            start_currency (str): The starting currency.
-            end_currency (str): The ending currency.
-        """
-
-        # Extract all unique nodes
-        nodes = set(u for u, _, _ in edges).union(v for _, v, _ in edges)
-        distance = {node: self.INF for node in nodes}
-        predecessor = {node: None for node in nodes}
-        distance[start_currency] = 0
-
-        # Relax all edges |V| - 1 times
-        for _ in range(len(nodes) - 1):
-            for u, v, w in edges:
-                if round(distance[u] + w, 3) < round(distance[v], 3):
-                    distance[v] = round(distance[u] + w, 3)
-                    predecessor[v] = u
-
-        # Check for negative weight cycles
-        arbitrage_found = False
-        cycle_start = None
-
-        for u, v, w in edges:
-            if round(distance[u] + w, 3) < round(distance[v], 3):
-                arbitrage_found = True
-                cycle_start = v
-                break
-
-        if arbitrage_found:
-            # If there is an arbitrage, trace the path using predecessors
-            cycle = []
-            current = cycle_start
-
-            # Find the cycle starting point
-            for _ in range(len(nodes)):
-                current = predecessor[current]
-
-            cycle_start = current
-
-            # Trace back to find the complete cycle
-            while True:
-                cycle.append(current)
-                current = predecessor[current]
-                if current == cycle_start:
-                    cycle.append(current)
-                    break
-            cycle.reverse()
-
-            # Calculate the product of exchange rates for the detected cycle, calculated using 3 dp rounded values
-            gain_product = 1.0
-            for i in range(len(cycle) - 1):
-                from_currency = cycle[i]
-                to_currency = cycle[i + 1]
-                rate = exchange_rates.get(from_currency, {}).get(to_currency, 'N/A')
-                if rate != 'N/A':
-                    gain_product *= round(float(rate), 3)
-
-            # Construct the output string labels
-            path = ' -> '.join(cycle)
-            self.ex.arbitrage_info = (f"Arbitrage opportunity found: {path}\n"
-                                        f"Potential gain: {(gain_product - 1) * 100:.2f}%")
-            self.ex.path_info = "No path found. Due to arbitrage present."
-        else:
-            self.ex.arbitrage_info = "No arbitrage opportunity detected."
-
-            # Find the shortest path from start_currency to end_currency
-            shortest_path = self._reconstruct_path(predecessor, start_currency, end_currency)
-            if shortest_path:
-                path_str = ' -> '.join(shortest_path)
-                self.ex.path_info = f"Path from {start_currency} to {end_currency}: {path_str}"
-
-    def _reconstruct_path(self, predecessor, start_currency, end_currency):
-        """
-        Reconstruct the shortest path from start_currency to end_currency.
-
-        Args:
-            predecessor (dict): The predecessor map for path reconstruction.
-            start_currency (str): The starting currency.
-            end_currency (str): The ending currency.
-
-        Returns:
-            list: The list of currencies in the shortest path.
-        """
-
-        path = []
-        current = end_currency
-
-        while current is not None:
-            path.append(current)
-            current = predecessor[current]
-
-            if current == start_currency:
-                path.append(start_currency)
-                break
-            if len(path) > len(predecessor):  # Detect a possible cycle or infinite loop
-                return []  # No valid path found
-
-        path.reverse()
-        return path if path[0] == start_currency else []
-
-# Function to fetch exchange rates from the API
-def fetch_exchange_rates(currencies):
-    """
-    Fetch live exchange rates for a list of currencies and store them in a global dictionary.
-
-    Args:
-        currencies (list): List of currency codes to fetch rates for.
-    """
-
-    global exchange_rates
-    # Fetch live exchange rates from API
-    try:
-        for base_currency in currencies:
-            response = requests.get(f"https://api.exchangerate-api.com/v4/latest/{base_currency.strip()}")
-            response.raise_for_status()  # Check for request errors
-            all_rates = response.json().get('rates', {})
-
-            # Filter rates to include only those in the 'currencies' list
-            filtered_rates = {currency: rate for currency, rate in all_rates.items() if
-                              currency in currencies and currency != base_currency}
-
-            exchange_rates[base_currency] = filtered_rates
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching exchange rates: {e}")
-
 # Function to update the matrix view with fetched exchange rates
 def update_matrix_view(event=None):
     """
     Update the matrix view with the latest exchange rates and check for arbitrage opportunities.
     """
-    global exchange_rates
-
-    # Fetch selected currencies from dropdowns (allow blanks)
-    selected_currencies = [currency1.get(), currency2.get(), currency3.get(), currency4.get(), currency5.get()]
+    global rates_from_service
 
-    # Ensure there are at least two non-blank currencies selected
-    if len([currency for currency in selected_currencies if currency]) < 2:
+    # Ensure there are at least two currencies selected
+    if len(universe) < 2:
         messagebox.showerror("Selection Error", "Please select at least two different currencies.")
         return
 
-    # Fetch exchange rates for non-blank currencies only
-    non_blank_currencies = [currency for currency in selected_currencies if currency]
-    fetch_exchange_rates(non_blank_currencies)
+    # Fetch exchange rates for the selected currencies into a draft, then publish it as a whole
+    draft = snapshots.draft(universe.codes)
+    if rate_service is not None:
+        rate_service.fetch_exchange_rates(universe.codes, draft)
+        rates_from_service = True
+    elif shared_rates is not None:
+        shared_rates.fetch_exchange_rates(universe.codes, draft, fallback=fetch_exchange_rates)
+    else:
+        fetch_exchange_rates(universe.codes, draft)
+    universe.update(snapshots.publish(draft).view)
     update_conversion_rate_dropdowns()
 
     # Update the matrix view with exchange rates
-    for i, currency in enumerate(selected_currencies):
-
-        # Set the table headers; if currency is blank, set cell to blank
-        conversion_rates[0][i + 1].config(text=currency if currency else "")
-        conversion_rates[i + 1][0].config(text=currency if currency else "")
-
-        for j, rate_currency in enumerate(selected_currencies):
-            if i == j and currency:  # Diagonal cells should show 1.000
-                conversion_rates[i + 1][j + 1].config(text="1.000")
-            elif not currency or not rate_currency:  # Cells with blank currencies
-                conversion_rates[i + 1][j + 1].config(text="")
-            else:
-                # Set fetched exchange rate or 'N/A'
-                rate = exchange_rates.get(currency, {}).get(rate_currency, 'N/A')
-                conversion_rates[i + 1][j + 1].config(text=f"{rate:.3f}" if rate != 'N/A' else 'N/A')
-
-    # Detect arbitrage if there are at least two selected currencies
-    if len(non_blank_currencies) >= 2:
-        edges = create_graph_from_rates(exchange_rates)
-        bellman_ford = BellmanFord(ex)
-        bellman_ford.find_arbitrage_and_shortest_path(edges, selected_currency_1.get(), selected_currency_2.get())
-
-        # Update arbitrage and best path info
-        arbitrage_info.set(ex.arbitrage_info)
-        bestpath_info.set(ex.path_info)
+    matrix_view.set_data(universe.codes, universe.rates)
+
+    # Detect arbitrage and update arbitrage and best path info
+    detect_arbitrage()
+    arbitrage_info.set(ex.arbitrage_info)
+    bestpath_info.set(ex.path_info)
+
+def detect_arbitrage():
+    """
+    Detect arbitrage for the selected currency pair and update the labels.
 
+    With a rate service the shared result is used. Otherwise Bellman-Ford runs locally when the rates
+    changed; while they don't, a new pair is answered from the last run (with Dijkstra if there was no arbitrage).
+    """
+    snapshot = snapshots.current  # Every step below works on this one snapshot, even if a newer one is published
+    exchange_rates = snapshot.view
+    if rates_from_service:
+        # Tagged with the version of the service's snapshot
+        rate_service.find_arbitrage_and_shortest_path(ex, list(exchange_rates), selected_currency_1.get(), selected_currency_2.get())
     else:
-        # Clear arbitrage and path info if fewer than two currencies are selected
-        arbitrage_info.set("")
-        bestpath_info.set("")
+        if rates_changed(exchange_rates) or not bellman_ford.find_cached_path(selected_currency_1.get(), selected_currency_2.get()):
+            edges = create_graph_from_rates(exchange_rates)
+            bellman_ford.find_arbitrage_and_shortest_path(edges, selected_currency_1.get(), selected_currency_2.get(), exchange_rates)
+        ex.version = snapshot.version
+
+    show_hop_tradeoff()
 
-def create_graph_from_rates(rates):
+def show_hop_tradeoff():
     """
-    Create a negative logarithm graph representation of the exchange rates for use with the Bellman-Ford algorithm.
+    Show the best rate between the selected pair for each number of conversions up to MAX_HOPS.
     """
-    edges = []
-    for from_currency in rates:
-        for to_currency in rates:
-            if from_currency != to_currency and from_currency and to_currency:  # Skip blanks
-                rate = rates[from_currency].get(to_currency, 'N/A')
-                if rate != 'N/A':
-                    # Convert rate to float and round it to 3 decimal places
-                    rate_value = round(float(rate), 3)
-                    # Create edge with weight as negative log of rate (rounded to 3 decimal places)
-                    weight = -round(np.log10(rate_value), 3)
-                    edges.append((from_currency, to_currency, weight))
-    return edges
-
-def update_selected_currencies(*args):
+    start_currency, end_currency = selected_currency_1.get(), selected_currency_2.get()
+    if start_currency not in universe or end_currency not in universe:
+        hops_info.set("")
+        return
+
+    paths = HopLimitedPaths(universe.rates, universe.index[start_currency], MAX_HOPS)
+    best_rates = paths.best_rates(universe.index[end_currency])
+    hops_info.set("Best rate by conversions: " + ", ".join(
+        f"{hops}: N/A" if math.isnan(rate) else f"{hops}: {rate:.3f}" for hops, rate in enumerate(best_rates, start=1)))
+
+def update_selected_currencies():
     """
-    Update the selected currencies list based on current dropdown selections.
+    Show the selected currencies in the list box.
     """
-    selected_currencies[0] = currency1.get()
-    selected_currencies[1] = currency2.get()
-    selected_currencies[2] = currency3.get()
-    selected_currencies[3] = currency4.get()
-    selected_currencies[4] = currency5.get()
+    currency_list.delete(0, tk.END)
+    for currency in universe.codes:
+        currency_list.insert(tk.END, currency)
 
-def on_currency_select(event):
+def add_currency(event=None):
     """
-    Handle changes in currency selection and update the matrix view accordingly.
+    Add the currency in the entry box to the selection and refresh the matrix view.
     """
-    update_matrix_view()
+    currency = new_currency.get().strip().upper()
+    if not currency or currency in universe:
+        return
+    universe.add(currency)
+    new_currency.set("")
+    update_selected_currencies()
+    if len(universe) >= 2:
+        update_matrix_view()
+    else:
+        matrix_view.set_data(universe.codes, universe.rates)
+
+def remove_currency(event=None):
+    """
+    Remove the currencies highlighted in the list box and refresh the matrix view.
+    """
+    for index in currency_list.curselection():
+        universe.remove(currency_list.get(index))
+    update_selected_currencies()
+    if len(universe) >= 2:
+        update_matrix_view()
+    else:
+        matrix_view.set_data(universe.codes, universe.rates)
 
 def on_dropdown_select(event):
     """
     Handle changes in dropdown selections and update exchange rates and arbitrage information.
     """
-    global exchange_rates
-
     update_conversion_rate_dropdowns()
     # Detect arbitrage
-    edges = create_graph_from_rates(exchange_rates)
-    bellman_ford = BellmanFord(ex)
-    bellman_ford.find_arbitrage_and_shortest_path(edges, selected_currency_1.get(), selected_currency_2.get())
+    detect_arbitrage()
     # Update arbitrage info
     arbitrage_info.set(ex.arbitrage_info)
 
@@ -274,7 +158,7 @@ def update_second_dropdown(*args):
     Update the options in the second currency dropdown based on the selected value of the first dropdown.
     """
     selected_1 = selected_currency_1.get()
-    updated_options = [currency for currency in selected_currencies if currency != selected_1 and currency]  # Skip blanks
+    updated_options = [currency for currency in universe.codes if currency != selected_1]
     currency_dropdown_2['values'] = updated_options
 
     # If the selected currency in dropdown 2 is no longer valid, reset it
@@ -287,7 +171,7 @@ def update_first_dropdown(*args):
     Update the options in the first currency dropdown based on the selected value of the second dropdown.
     """
     selected_2 = selected_currency_2.get()
-    updated_options = [currency for currency in selected_currencies if currency != selected_2 and currency]  # Skip blanks
+    updated_options = [currency for currency in universe.codes if currency != selected_2]
     currency_dropdown_1['values'] = updated_options
 
     # If the selected currency in dropdown 1 is no longer valid, reset it
@@ -304,43 +188,32 @@ def update_conversion_rate_dropdowns(*args):
 # Add a button to set the selected currencies to those in the exchange_rates_no_arbitrage dictionary
 def set_custom_currencies(custom_currencies):
     """
-    Set custom currencies in the dropdowns based on provided rates.
+    Select the currencies of the provided rates and show those rates.
     """
-    # Use currencies to update the dropdowns
-    available_currencies_in_dict = list(custom_currencies.keys())
-
-    # Disable interaction with dropdowns
-    for selector in currency_selectors:
-        selector.config(state="disabled")
-
-    # Set the available currencies from the dictionary into the dropdowns (up to 5)
-    currency_list = [currency1, currency2, currency3, currency4, currency5]
+    # Disable changing the selection while custom rates are shown
+    for widget in selection_widgets:
+        widget.config(state="disabled")
 
-    # Loop through the selectors and set values based on available currencies
-    for i, selector in enumerate(currency_list):
-        if i < len(available_currencies_in_dict):
-            selector.set(available_currencies_in_dict[i])
-        else:
-            selector.set("")  # Clear the remaining selectors if fewer than 5 currencies are available
+    universe.clear()
+    for currency in custom_currencies:
+        universe.add(currency)
+    update_selected_currencies()
 
-
-    # Update the selected currencies list and matrix view with custom rates
+    # Update the matrix view with custom rates
     update_matrix_view_with_custom_rates(custom_currencies)
 
 def reset_gui():
     """
-    Reset the dropdowns to the first 5 available currencies.
+    Reset the selection to the default currencies.
     """
+    universe.clear()
+    for currency in default_currencies:
+        universe.add(currency)
+    update_selected_currencies()
 
-    currency1.set(available_currencies[0])
-    currency2.set(available_currencies[1])
-    currency3.set(available_currencies[2])
-    currency4.set(available_currencies[3])
-    currency5.set(available_currencies[4])
-
-    # Enable interaction with dropdowns
-    for selector in currency_selectors:
-        selector.config(state="enabled")
+    # Enable changing the selection
+    for widget in selection_widgets:
+        widget.config(state="normal")
 
     # Update the matrix view with the newly set currencies
     update_matrix_view()
@@ -354,43 +227,27 @@ def update_matrix_view_with_custom_rates(custom_currencies):
                                   of exchange rates, with inner dictionaries mapping other currency names
                                   to exchange rates.
     """
-    global exchange_rates
-    # Fetch selected currencies from dropdowns (allow blanks)
-    selected_currencies = [currency1.get(), currency2.get(), currency3.get(), currency4.get(), currency5.get()]
+    global rates_from_service
 
-    # Filter out any blank selections
-    non_blank_currencies = [currency for currency in selected_currencies if currency]
-
-    # Ensure there are at least two non-blank selections
-    if len(non_blank_currencies) < 2:
+    # Ensure there are at least two currencies selected
+    if len(universe) < 2:
         messagebox.showerror("Selection Error", "Please select at least two different currencies.")
         return
 
-    # Use custom exchange rates for the non-blank selected currencies
-    exchange_rates = {currency: custom_currencies[currency] for currency in non_blank_currencies}
+    # Use the custom exchange rates for the selected currencies
+    universe.update(custom_currencies)
+    draft = snapshots.draft(universe.codes)
+    draft.load(universe.rates)
+    snapshots.publish(draft)
+    rates_from_service = False  # The rate service doesn't know about custom rates
 
     # Update the matrix view with the selected currencies and their rates
-    for i, currency in enumerate(selected_currencies):
-        # Set the table headers; if currency is blank, set cell to blank
-        conversion_rates[0][i + 1].config(text=currency if currency else "")
-        conversion_rates[i + 1][0].config(text=currency if currency else "")
-
-        for j, rate_currency in enumerate(selected_currencies):
-            if i == j and currency:  # Diagonal cells should show 1.000 for non-blank currencies
-                conversion_rates[i + 1][j + 1].config(text="1.000")
-            elif not currency or not rate_currency:  # If any currency is blank, set cell to blank
-                conversion_rates[i + 1][j + 1].config(text="")
-            else:
-                # Otherwise, set the fetched exchange rate or 'N/A' if not available
-                rate = exchange_rates.get(currency, {}).get(rate_currency, 'N/A')
-                conversion_rates[i + 1][j + 1].config(text=f"{rate:.3f}" if rate != 'N/A' else 'N/A')
+    matrix_view.set_data(universe.codes, universe.rates)
 
     update_conversion_rate_dropdowns()
 
-    # Detect arbitrage if enough currencies are selected
-    edges = create_graph_from_rates(exchange_rates)
-    bellman_ford = BellmanFord(ex)
-    bellman_ford.find_arbitrage_and_shortest_path(edges, selected_currency_1.get(), selected_currency_2.get())
+    # Detect arbitrage
+    detect_arbitrage()
 
     # Update arbitrage info
     arbitrage_info.set(ex.arbitrage_info)
@@ -417,8 +274,8 @@ def get_input(input_text_field, input_window):
     # First line is the number of rows/columns
     num_columns = int(lines[0].split(',')[0].strip())
 
-    if num_columns < 2 or num_columns > 5:
-        messagebox.showerror("Input Error", "Please input between 2 and 5 currencies")
+    if num_columns < 2:
+        messagebox.showerror("Input Error", "Please input at least 2 currencies")
         return
 
     # The rest of the first line are the labels for the rows/columns
@@ -480,139 +337,123 @@ def create_own_matrix():
     # Start the GUI loop
     input_window.mainloop()
 
-# Initialize Tkinter window
-root = tk.Tk()
-root.geometry('1200x550')
-root.title("Currency Exchange")
-
-# Define available currencies
-available_currencies = ['USD', 'NZD', 'AUD', 'EUR', 'JPY', 'THB', 'INR', 'BOB', 'BRL', '']
-
-# Create frames
-top_left_frame = tk.Frame(root)
-top_right_frame = tk.Frame(root)
-bottom_left_frame = tk.Frame(root)
-bottom_right_frame = tk.Frame(root)
-
-# Place frames in a grid with padding
-top_left_frame.grid(row=0, column=0, padx=40, pady=10, sticky="nw")
-top_right_frame.grid(row=0, column=1, padx=40, pady=10, sticky="ne")
-bottom_left_frame.grid(row=1, column=0, padx=40, pady=10, sticky="sw")
-bottom_right_frame.grid(row=1, column=1, padx=40, pady=10, sticky="se")
-
-# Add color to frames
-bottom_left_frame.config(background="white")
-bottom_right_frame.config(background="white")
-
-# Create the title for dropdown selectors
-dropdown_title = tk.Label(top_left_frame, text="Currencies", font=('Arial', 12, 'bold'))
-dropdown_title.grid(row=0, column=0, padx=5, pady=5, sticky="n")
-
-# Create dropdown selectors for currencies
-currency1 = tk.StringVar(value=available_currencies[0])
-currency2 = tk.StringVar(value=available_currencies[1])
-currency3 = tk.StringVar(value=available_currencies[2])
-currency4 = tk.StringVar(value=available_currencies[3])
-currency5 = tk.StringVar(value=available_currencies[4])
-
-currency_selectors = [
-    ttk.Combobox(top_left_frame, textvariable=currency1, values=available_currencies),
-    ttk.Combobox(top_left_frame, textvariable=currency2, values=available_currencies),
-    ttk.Combobox(top_left_frame, textvariable=currency3, values=available_currencies),
-    ttk.Combobox(top_left_frame, textvariable=currency4, values=available_currencies),
-    ttk.Combobox(top_left_frame, textvariable=currency5, values=available_currencies)
-]
-
-# Create a list to store the currently selected currencies
-selected_currencies = [currency1.get(), currency2.get(), currency3.get(), currency4.get(), currency5.get()]
-
-# Bind the trace method to each currency variable to update the selected_currencies list on change
-currency1.trace('w', update_selected_currencies)
-currency2.trace('w', update_selected_currencies)
-currency3.trace('w', update_selected_currencies)
-currency4.trace('w', update_selected_currencies)
-currency5.trace('w', update_selected_currencies)
-
-# Create the dropdowns in the top_left_frame and place them
-for idx, selector in enumerate(currency_selectors):
-    selector.grid(row=idx, column=0, padx=5, pady=5)
-
-# Place currency selectors in a vertical column on the left side
-for i, selector in enumerate(currency_selectors):
-    selector.grid(row=i + 1, column=0, padx=5, pady=10, sticky="w")
-    selector.bind("<<ComboboxSelected>>", on_currency_select)
-
-# Matrix to display conversion rates
-conversion_rates = [[None for _ in range(6)] for _ in range(6)]
-
-# Matrix view title
-matrix_title = tk.Label(top_right_frame, text="Exchange Rate Matrix", font=('Arial', 12, 'bold'))
-matrix_title.grid(row=0, column=0, columnspan=6, padx=5, pady=5, sticky="w")
-
-# Set up headers and initialize matrix cells
-conversion_rates[0][0] = tk.Label(top_right_frame, text="From/To", borderwidth=1, relief="solid", width=15, height=2)
-conversion_rates[0][0].grid(row=1, column=0, sticky="nsew")
-
-for i in range(5):
-    conversion_rates[0][i + 1] = tk.Label(top_right_frame, text="N/A", borderwidth=1, relief="solid", width=15, height=2)
-    conversion_rates[0][i + 1].grid(row=1, column=i + 1, sticky="nsew")  # Top row headers
-
-    conversion_rates[i + 1][0] = tk.Label(top_right_frame, text="N/A", borderwidth=1, relief="solid", width=15, height=2)
-    conversion_rates[i + 1][0].grid(row=i + 2, column=0, sticky="nsew")  # Left column headers
-
-    for j in range(5):
-        conversion_rates[i + 1][j + 1] = tk.Label(top_right_frame, text="N/A", borderwidth=1, relief="solid", width=15, height=2)
-        conversion_rates[i + 1][j + 1].grid(row=i + 2, column=j + 1, sticky="nsew")  # Main matrix
-
-# Label for arbitrage information
-ex = Labels()
-arbitrage_info = tk.StringVar(value="No arbitrage opportunity detected.")
-arbitrage_label = tk.Label(bottom_left_frame, textvariable=arbitrage_info, wraplength=400, background="white", font=('Arial', 10))
-arbitrage_label.grid(row=0, column=0, padx=10, pady=10, sticky="w")
-
-# Add a title above the dropdowns
-title_label = ttk.Label(bottom_right_frame, text="Best Conversion Rate")
-title_label.grid(row=0, column=0, columnspan=3, pady=10)
-
-# Create variables for the two dropdowns
-selected_currency_1 = tk.StringVar(value=selected_currencies[0])
-selected_currency_2 = tk.StringVar(value=selected_currencies[1])
-
-# Create the dropdowns in the bottom-right frame
-currency_dropdown_1 = ttk.Combobox(bottom_right_frame, textvariable=selected_currency_1, values=selected_currencies)
-currency_dropdown_2 = ttk.Combobox(bottom_right_frame, textvariable=selected_currency_2, values=selected_currencies)
-
-# Position the dropdowns
-currency_dropdown_1.grid(row=1, column=0, padx=10, pady=10)
-currency_dropdown_2.grid(row=1, column=2, padx=10, pady=10)
-
-# Add an arrow between the dropdowns
-arrow_label = ttk.Label(bottom_right_frame, text=" -> ")
-arrow_label.grid(row=1, column=1, pady=10)
-
-bestpath_info = tk.StringVar(value="Loading..")
-bestpath_label = tk.Label(bottom_right_frame, textvariable=bestpath_info, background="white", font=('Arial', 10))
-bestpath_label.grid(row=2, column=0)
-
-# Bind the selection event to the update functions
-currency_dropdown_1.bind("<<ComboboxSelected>>", on_dropdown_select)
-currency_dropdown_2.bind("<<ComboboxSelected>>", on_dropdown_select)
-
-# Create and place the button in the bottom-left frame
-arbitrage_button = ttk.Button(bottom_left_frame, text="Case 1: No Arbitrage, Direct Path", command=lambda: set_custom_currencies(exchange_rates_no_arbitrage_direct))
-arbitrage_button.grid(row=1, column=0, padx=10, pady=10, sticky="w")
-
-arbitrage_button2 = ttk.Button(bottom_left_frame, text="Case 2: No Arbitrage, Indirect Path", command=lambda: set_custom_currencies(exchange_rates_no_arbitrage_indirect))
-arbitrage_button2.grid(row=2, column=0, padx=10, pady=10, sticky="w")
-
-reset_button = ttk.Button(bottom_left_frame, text="Reset", command=lambda: reset_gui())
-reset_button.grid(row=3, column=0, padx=10, pady=10, sticky="w")
-
-input_button = ttk.Button(root, text="Input Custom Matrix", command=create_own_matrix)
-input_button.grid(row=4, column=0, padx=10, pady=10, sticky="w")
-
-# Refresh matrix view
-update_matrix_view()
+if __name__ == '__main__':
+    # Initialize Tkinter window
+    root = tk.Tk()
+    root.geometry('1200x550')
+    root.title("Currency Exchange")
+
+    # Currencies offered in the entry box and selected on start-up; any other code can be typed in
+    available_currencies = ['USD', 'NZD', 'AUD', 'EUR', 'JPY', 'THB', 'INR', 'BOB', 'BRL']
+    default_currencies = available_currencies[:5]
+
+    # The selected currencies and the rates between them
+    universe = CurrencyUniverse(default_currencies)
+    snapshots = SnapshotHolder(default_currencies)
+
+    # Create frames
+    top_left_frame = tk.Frame(root)
+    top_right_frame = tk.Frame(root)
+    bottom_left_frame = tk.Frame(root)
+    bottom_right_frame = tk.Frame(root)
+
+    # Place frames in a grid with padding
+    top_left_frame.grid(row=0, column=0, padx=40, pady=10, sticky="nw")
+    top_right_frame.grid(row=0, column=1, padx=40, pady=10, sticky="ne")
+    bottom_left_frame.grid(row=1, column=0, padx=40, pady=10, sticky="sw")
+    bottom_right_frame.grid(row=1, column=1, padx=40, pady=10, sticky="se")
+
+    # Add color to frames
+    bottom_left_frame.config(background="white")
+    bottom_right_frame.config(background="white")
+
+    # Create the title for dropdown selectors
+    dropdown_title = tk.Label(top_left_frame, text="Currencies", font=('Arial', 12, 'bold'))
+    dropdown_title.grid(row=0, column=0, padx=5, pady=5, sticky="n")
+
+    # List of the selected currencies, any number of them
+    currency_list = tk.Listbox(top_left_frame, height=8, selectmode=tk.EXTENDED, exportselection=False)
+    currency_list.grid(row=1, column=0, columnspan=2, padx=5, pady=5, sticky="nsew")
+    update_selected_currencies()
+
+    # Entry box and buttons to add and remove currencies
+    new_currency = tk.StringVar()
+    currency_entry = ttk.Combobox(top_left_frame, textvariable=new_currency, values=available_currencies, width=10)
+    currency_entry.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+    currency_entry.bind("<Return>", add_currency)
+    currency_entry.bind("<<ComboboxSelected>>", add_currency)
+
+    add_button = ttk.Button(top_left_frame, text="Add", command=add_currency)
+    add_button.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+
+    remove_button = ttk.Button(top_left_frame, text="Remove selected", command=remove_currency)
+    remove_button.grid(row=3, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+    currency_list.bind("<Delete>", remove_currency)
+
+    selection_widgets = [currency_list, currency_entry, add_button, remove_button]
+
+    # Matrix view title
+    matrix_title = tk.Label(top_right_frame, text="Exchange Rate Matrix", font=('Arial', 12, 'bold'))
+    matrix_title.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+
+    # Matrix to display conversion rates, scrolls when there are more currencies than fit
+    matrix_view = MatrixView(top_right_frame)
+    matrix_view.grid(row=1, column=0, sticky="nsew")
+
+    # Label for arbitrage information
+    ex = Labels()
+    bellman_ford = BellmanFord(ex, check_every=4)
+    arbitrage_info = tk.StringVar(value="No arbitrage opportunity detected.")
+    arbitrage_label = tk.Label(bottom_left_frame, textvariable=arbitrage_info, wraplength=400, background="white", font=('Arial', 10))
+    arbitrage_label.grid(row=0, column=0, padx=10, pady=10, sticky="w")
+
+    # Add a title above the dropdowns
+    title_label = ttk.Label(bottom_right_frame, text="Best Conversion Rate")
+    title_label.grid(row=0, column=0, columnspan=3, pady=10)
+
+    # Create variables for the two dropdowns
+    selected_currency_1 = tk.StringVar(value=universe.codes[0])
+    selected_currency_2 = tk.StringVar(value=universe.codes[1])
+
+    # Create the dropdowns in the bottom-right frame
+    currency_dropdown_1 = ttk.Combobox(bottom_right_frame, textvariable=selected_currency_1, values=universe.codes)
+    currency_dropdown_2 = ttk.Combobox(bottom_right_frame, textvariable=selected_currency_2, values=universe.codes)
+
+    # Position the dropdowns
+    currency_dropdown_1.grid(row=1, column=0, padx=10, pady=10)
+    currency_dropdown_2.grid(row=1, column=2, padx=10, pady=10)
+
+    # Add an arrow between the dropdowns
+    arrow_label = ttk.Label(bottom_right_frame, text=" -> ")
+    arrow_label.grid(row=1, column=1, pady=10)
+
+    bestpath_info = tk.StringVar(value="Loading..")
+    bestpath_label = tk.Label(bottom_right_frame, textvariable=bestpath_info, background="white", font=('Arial', 10))
+    bestpath_label.grid(row=2, column=0)
+
+    hops_info = tk.StringVar(value="")
+    hops_label = tk.Label(bottom_right_frame, textvariable=hops_info, background="white", font=('Arial', 10))
+    hops_label.grid(row=3, column=0, columnspan=3, sticky="w")
+
+    # Bind the selection event to the update functions
+    currency_dropdown_1.bind("<<ComboboxSelected>>", on_dropdown_select)
+    currency_dropdown_2.bind("<<ComboboxSelected>>", on_dropdown_select)
+
+    # Create and place the button in the bottom-left frame
+    arbitrage_button = ttk.Button(bottom_left_frame, text="Case 1: No Arbitrage, Direct Path", command=lambda: set_custom_currencies(exchange_rates_no_arbitrage_direct))
+    arbitrage_button.grid(row=1, column=0, padx=10, pady=10, sticky="w")
+
+    arbitrage_button2 = ttk.Button(bottom_left_frame, text="Case 2: No Arbitrage, Indirect Path", command=lambda: set_custom_currencies(exchange_rates_no_arbitrage_indirect))
+    arbitrage_button2.grid(row=2, column=0, padx=10, pady=10, sticky="w")
+
+    reset_button = ttk.Button(bottom_left_frame, text="Reset", command=lambda: reset_gui())
+    reset_button.grid(row=3, column=0, padx=10, pady=10, sticky="w")
+
+    input_button = ttk.Button(root, text="Input Custom Matrix", command=create_own_matrix)
+    input_button.grid(row=4, column=0, padx=10, pady=10, sticky="w")
+
+    # Refresh matrix view
+    update_matrix_view()
 
-# Run the application
-root.mainloop()
\ No newline at end of file
+    # Run the application
+    root.mainloop()
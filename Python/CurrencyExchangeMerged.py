@@ -1,5 +1,6 @@
-import math
-import requests
+import sys
+
+from Cycles import ArbitrageSet, CycleMemory, predecessor_cycle, top_k_cycles
 
 # Graphs
 class Edge:
@@ -9,16 +10,60 @@ class Edge:
         self.weight = weight
 
 class Graph:
-    def __init__(self, no_vertices):
+    def __init__(self, no_vertices, memory=0):
         self.no_vertices = no_vertices
         self.edges = []
-        self.arbitrages = []
+        self.lookup = {} # (start, destination) -> Edge
+        self.arbitrages = ArbitrageSet()
+        # When set, remember up to 'memory' cycles across runs so repeat detections are reported as still open.
+        # A CycleMemory can also be passed in to share it between graphs built from successive snapshots
+        if isinstance(memory, CycleMemory):
+            self.memory = memory
+        else:
+            self.memory = CycleMemory(memory) if memory else None
 
     # Add edge
     def add_edge(self, start, destination, weight):
-        self.edges.append(Edge(start,destination,weight))
+        edge = Edge(start,destination,weight)
+        self.edges.append(edge)
+        self.lookup[(start, destination)] = edge
 
-    def bellman_ford(self, source):                  # Bellman-Ford Algorithm
+    # Add many edges at once, from parallel sequences of starts, destinations and weights
+    def add_edges(self, starts, destinations, weights):
+        edges = list(map(Edge, starts, destinations, weights))
+        self.edges.extend(edges)
+        self.lookup.update(((edge.start, edge.destination), edge) for edge in edges)
+
+    # Change the weight of an edge, adding it if needed
+    def set_edge(self, start, destination, weight):
+        if (start, destination) in self.lookup:
+            self.lookup[(start, destination)].weight = weight
+        else:
+            self.add_edge(start, destination, weight)
+
+    def remove_edge(self, start, destination):
+        edge = self.lookup.pop((start, destination), None)
+        if edge is not None:
+            self.edges.remove(edge)
+
+    # Add a vertex with no edges, returns its number
+    def add_vertex(self):
+        self.no_vertices += 1
+        return self.no_vertices - 1
+
+    # Remove a vertex and its edges; the last vertex is renumbered to take its place
+    def remove_vertex(self, vertex):
+        last = self.no_vertices - 1
+        self.edges = [edge for edge in self.edges if vertex not in (edge.start, edge.destination)]
+        for edge in self.edges:
+            if edge.start == last:
+                edge.start = vertex
+            if edge.destination == last:
+                edge.destination = vertex
+        self.lookup = {(edge.start, edge.destination): edge for edge in self.edges}
+        self.no_vertices = last
+
+    def relax(self, source):
         distance = [float("Inf")] * self.no_vertices # Start with distances as infinity
         predecessor = [-1] * self.no_vertices        # Predecessor array to store path
         distance[source] = 0                         # distance to source node is always 0
@@ -31,19 +76,144 @@ class Graph:
                     distance[edge.destination] = distance[edge.start] + edge.weight # Update the shortest path found
                     predecessor[edge.destination] = edge.start
 
+        return distance, predecessor
+
+    def bellman_ford(self, source):                  # Bellman-Ford Algorithm
+        distance, predecessor = self.relax(source)
+
+        # The arbitrages are those open now, older runs live in the memory if there is one
+        self.arbitrages.clear()
+
         # Check for negative cycles after n-1 iterations
         found_cycles = False
         for edge in self.edges:  # For each edge
             if distance[edge.start] + edge.weight < distance[edge.destination]:  # If there is a shorter path
                 # Add the negative cycle to the list of arbitrages
+                predecessor[edge.destination] = edge.start
                 cycle = self.get_negative_cycle(predecessor, edge.destination)
-                if cycle not in self.arbitrages:  # To avoid duplicates
-                    self.arbitrages.append(cycle)
-                    found_cycles = True
+                if cycle:
+                    found_cycles |= self.record_arbitrage(cycle)
+
+        return found_cycles, self.arbitrages
+
+    # Early exit mode: return the first arbitrage found, checking the predecessor graph for a cycle every few passes
+    def first_arbitrage(self, source, check_every=4):
+        distance = [float("Inf")] * self.no_vertices
+        predecessor = [-1] * self.no_vertices
+        distance[source] = 0
+
+        # After the usual n-1 passes, one more pass that still changes something means a negative cycle,
+        # and the predecessor graph is then sure to contain it
+        for i in range(self.no_vertices):
+            changed = False
+            for edge in self.edges:
+                if distance[edge.start] != float('inf') and distance[edge.start] + edge.weight < distance[edge.destination]:
+                    distance[edge.destination] = distance[edge.start] + edge.weight
+                    predecessor[edge.destination] = edge.start
+                    changed = True
+
+            if not changed:
+                return None # Converged, no arbitrage reachable from the source
+            if (i + 1) % check_every == 0 or i == self.no_vertices - 1:
+                cycle = predecessor_cycle(predecessor, range(self.no_vertices))
+                if cycle:
+                    return cycle
+
+        return None
+
+    # Weight of an edge, None if there is no such edge
+    def edge_weight(self, start, destination):
+        edge = self.lookup.get((start, destination))
+        return edge.weight if edge is not None else None
+
+    # Recheck and report the cycles of the last scan first, then run a full scan only if it is due (see HotCycles.py).
+    # Returns True if a full scan ran; the arbitrages are then the cycles open in this snapshot
+    def scan_with_hot_cycles(self, hot, report=None):
+        still_open = hot.recheck(self.edge_weight)
+        if report is not None:
+            report(still_open)
+
+        if not hot.scan_due((edge.start, edge.destination, edge.weight) for edge in self.edges):
+            return False
+
+        self.bellman_ford_by_component()
+        hot.scanned(self.arbitrages, ((edge.start, edge.destination, edge.weight) for edge in self.edges))
+        return True
+
+    # Add a cycle to the arbitrages with its status, returns False if it was already there
+    def record_arbitrage(self, cycle):
+        if cycle in self.arbitrages:  # To avoid duplicates, including rotations
+            return False
+        status = ArbitrageSet.NEW
+        if self.memory is not None and self.memory.touch(cycle):
+            status = ArbitrageSet.STILL_OPEN
+        return self.arbitrages.add(cycle, status)
 
+    # Bellman-Ford on each strongly connected component separately, since a cycle never leaves its component
+    def bellman_ford_by_component(self, pool=None):
+        self.arbitrages.clear()
+        jobs = self.subgraphs(self.cyclic_components())
+        results = pool.map(component_cycles, jobs) if pool is not None and len(jobs) > 1 else map(component_cycles, jobs)
+
+        found_cycles = False
+        for cycles in results:
+            for cycle in cycles:
+                found_cycles |= self.record_arbitrage(cycle)
         return found_cycles, self.arbitrages
 
-    # Find where the negative cycle is
+    # Strongly connected components that can hold a cycle
+    def cyclic_components(self):
+        from Components import strongly_connected_components
+
+        # Singletons can't hold a cycle, every edge is between different vertices.
+        # Built from the edges themselves, which Bellman-Ford runs on, even if they were assigned directly
+        pairs = ((edge.start, edge.destination) for edge in self.edges)
+        return [component for component in strongly_connected_components(self.no_vertices, pairs) if len(component) > 1]
+
+    # Split the graph into one graph per component, vertices renumbered from 0, with their original numbers
+    def subgraphs(self, components):
+        number = {}
+        for c, component in enumerate(components):
+            for i, vertex in enumerate(component):
+                number[vertex] = (c, i)
+
+        graphs = [(Graph(len(component)), list(component)) for component in components]
+        for edge in self.edges:
+            if edge.start in number and edge.destination in number:
+                (c, i), (d, j) = number[edge.start], number[edge.destination]
+                if c == d: # Edges between components can't be on a cycle
+                    graphs[c][0].add_edge(i, j, edge.weight)
+        return graphs
+
+    # Rank the arbitrages by gain, best first
+    def top_arbitrages(self, source, k):
+        distance, predecessor = self.relax(source)
+        weights = {(edge.start, edge.destination): edge.weight for edge in self.edges}
+
+        # Every edge that can still be relaxed leads back to a negative cycle
+        def candidates():
+            for edge in self.edges:
+                if distance[edge.start] + edge.weight < distance[edge.destination]:
+                    predecessor[edge.destination] = edge.start
+                    cycle = self.get_negative_cycle(predecessor, edge.destination)
+                    if not cycle:
+                        continue
+                    # The gain is the negated weight of the cycle (log10 of the rate product)
+                    log_gain = -sum(weights[(cycle[i], cycle[i + 1])] for i in range(len(cycle) - 1))
+                    yield cycle, log_gain
+
+        return top_k_cycles(candidates(), k)
+
+    # Rank the arbitrages of every component together, so cycles not reachable from one source are included
+    def top_arbitrages_by_component(self, k):
+        def candidates():
+            for graph, vertices in self.subgraphs(self.cyclic_components()):
+                for cycle, log_gain in graph.top_arbitrages(0, k):
+                    yield [vertices[i] for i in cycle], log_gain
+
+        return top_k_cycles(candidates(), k)
+
+    # Find where the negative cycle is, None if the predecessors lead back to the source instead
     def get_negative_cycle(self, predecessor, start):
         cycle = [] # The nodes that are in the negative cycle
         visited = set() # Keep track of visited Node
@@ -53,6 +223,8 @@ class Graph:
         while node not in visited: # Loops until all nodes are visited
             visited.add(node) # Add the node to visited Node
             node = predecessor[node] # Move to the predecessor of the current node
+            if node == -1:
+                return None # Reached the source, there is no cycle behind this vertex
 
         cycle_start = node # The first node that was revisited
         cycle.append(cycle_start) # Add the first node to the cycle
@@ -67,11 +239,18 @@ class Graph:
         cycle.reverse() # Since the cycle is backwards, reverse it
         return cycle
 
+# Arbitrage cycles of one component, in the original vertex numbers (module level so a process pool can run it)
+def component_cycles(job):
+    graph, vertices = job
+    found, arbitrages = graph.bellman_ford(0) # Every vertex of a component is reachable from any other
+    return [[vertices[i] for i in cycle] for cycle in arbitrages]
+
 # API
 def fetch_exchange_rates(currencies):
-    # Fetch the latest exchange rates for the specified currencies using get
-    response = requests.get(f"https://api.exchangerate-api.com/v4/latest/USD")
-    rates = response.json().get('rates', {}) # Returns the rates, or an empty dictionary if the rates field is missing
+    from ExchangeCore import get_client # Only the API input needs requests
+
+    # Fetch the latest exchange rates for the specified currencies, with timeouts and retries
+    rates = get_client().get_rates('USD') # Returns the rates, or an empty dictionary if the rates field is missing
 
     # Creates and returns a matrix of the currency rates from the requested currencies
     matrix = [[1 if i == j else rates[currencies[j]] / rates[currencies[i]] for j in range(len(currencies))] for i in range(len(currencies))]
@@ -94,69 +273,108 @@ def get_exchange_rates_from_input():
     return currencies, matrix
 
 # Create a graph from a matrix and list of currencies
-def build_graph(currencies, matrix):
+def build_graph(currencies, matrix, ask=None, fees=None, memory=0):
     # Get the number of currencies and create a graph
     n = len(currencies)
-    graph = Graph(n)
+    graph = Graph(n, memory)
+
+    from RateGraph import edge_arrays # numpy is only imported once a graph is built
 
-    # Fill the graph with the matrix values
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                rate = matrix[i][j]
-                weight = -math.log10(rate) # using the negative logarithm
-                graph.add_edge(i, j, weight)
+    # Negative logarithm of the executable rates, with the spread and fees already folded in,
+    # skipping the diagonal and missing rates
+    starts, destinations, weights = edge_arrays(matrix, ask, fees)
+    graph.add_edges(starts.tolist(), destinations.tolist(), weights.tolist())
 
     return graph
 
+# Add (+CODE) or remove (-CODE) currencies, comma-separated, fetching rates only for the added ones
+def change_currencies(universe, changes):
+    for change in changes.split(','):
+        change = change.strip()
+        code = change[1:].strip()
+        if change.startswith('-') and code in universe:
+            universe.remove(code)
+        elif change.startswith('+') and code and code not in universe:
+            import requests # Only the API input needs requests
+            try:
+                matrix = fetch_exchange_rates(universe.codes + [code])
+            except KeyError:
+                print(f"Unknown currency: {code}")
+                continue
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching exchange rates: {e}")
+                continue
+            # The new currency is the last row and column
+            universe.add(code, dict(zip(universe.codes, matrix[-1])),
+                         {currency: row[-1] for currency, row in zip(universe.codes, matrix)})
+        elif change:
+            print(f"Ignoring '{change}'")
+
 # Runs the arbitrage program
-def find_arbitrage(graph, currencies):
-    arbitrage_exists, result = graph.bellman_ford(0)
+def find_arbitrage(graph, currencies, pool=None):
+    arbitrage_exists, result = graph.bellman_ford_by_component(pool)
     if arbitrage_exists:
-        print("Arbitrage detected! Currency sequence: " + " -> ".join(currencies[i] for i in result))
+        for cycle in result:
+            print("Arbitrage detected! Currency sequence: " + " -> ".join(currencies[i] for i in cycle)
+                  + (f" ({result.status(cycle)})" if graph.memory is not None else ""))
     else:
         print("No arbitrage opportunities found.")
 
 # Get the input type
 def input_type():
-    print('input type?')
-    print('1. API')
-    print('2. Custom')
-    choice = input('Choose input type (1 or 2): ')
-
-    # Return the appropriate string
-    if choice == '1':
-        print('API chosen')
-        return 'API'
-    elif choice == '2':
-        print('Custom chosen')
-        return 'Custom'
-    else:
-        print('Invalid choice. Try again.')
-        return input_type()
+    while True:
+        print('input type?')
+        print('1. API')
+        print('2. Custom')
+        choice = input('Choose input type (1 or 2): ')
+
+        # Return the appropriate string
+        if choice == '1':
+            print('API chosen')
+            return 'API'
+        elif choice == '2':
+            print('Custom chosen')
+            return 'Custom'
+        else:
+            print('Invalid choice. Try again.')
 
 def main():
-    # Get input choice
-    input_choice = input_type()
-
-    # Get currencies and matrix dependent on the chosen input
-    if input_choice == 'API':
-        currencies = [currency.strip() for currency in input("Enter currencies (comma-separated): ").split(',')]
-        matrix = fetch_exchange_rates(currencies)
-
-        # Print the exchange rate matrix
-        print("Exchange Rate Matrix:")
-        for row in matrix:
-            print(" ".join(f"{rate:.4f}" for rate in row))
-    else:
-        currencies, matrix = get_exchange_rates_from_input()
+    while True:
+        # Get input choice
+        input_choice = input_type()
 
-    graph = build_graph(currencies, matrix) # Build graph
+        # Get currencies and matrix dependent on the chosen input
+        if input_choice == 'API':
+            currencies = [currency.strip() for currency in input("Enter currencies (comma-separated): ").split(',')]
+            matrix = fetch_exchange_rates(currencies)
 
-    print('Detecting arbitrage opportunities...')
-    find_arbitrage(graph, currencies) # Run arbitrage program
+            # Print the exchange rate matrix
+            print("Exchange Rate Matrix:")
+            for row in matrix:
+                print(" ".join(f"{rate:.4f}" for rate in row))
+        else:
+            currencies, matrix = get_exchange_rates_from_input()
 
-    main()
+        from CurrencyUniverse import CurrencyUniverse # numpy is only imported once a graph is built
+
+        # Build the graph once, later currency changes update it in place
+        universe = CurrencyUniverse.from_matrix(currencies, matrix)
+        graph = universe.attach(Graph(0))
+
+        while True:
+            print('Detecting arbitrage opportunities...')
+            find_arbitrage(graph, universe.codes) # Run arbitrage program
+
+            if input_choice != 'API':
+                break
+            changes = input("Add or remove currencies (e.g. +GBP, -JPY), or press enter for a new input: ")
+            if not changes.strip():
+                break
+            change_currencies(universe, changes)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # With arguments, run headless over files instead of prompting (see ArbitrageBatch.py)
+    if len(sys.argv) > 1:
+        import ArbitrageBatch
+        sys.exit(ArbitrageBatch.main())
+    main()
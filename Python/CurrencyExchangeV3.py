@@ -1,6 +1,3 @@
-import math
-import requests
-
 # Graphs
 class Edge:
     def __init__(self, start, destination, weight):
@@ -19,6 +16,10 @@ class Graph:
     def add_edge(self, start, destination, weight):
         self.edges.append(Edge(start,destination,weight))
 
+    # Add many edges at once, from parallel sequences of starts, destinations and weights
+    def add_edges(self, starts, destinations, weights):
+        self.edges.extend(map(Edge, starts, destinations, weights))
+
     def bellman_ford(self, source):                  # Bellman-Ford Algorithm
         distance = [float("Inf")] * self.no_vertices # Start with distances as infinity
         predecessor = [-1] * self.no_vertices        # Predecessor array to store path
@@ -66,9 +67,10 @@ def get_negative_cycle(predecessor, start):
 
 # API
 def fetch_exchange_rates(currencies):
-    # Fetch the latest exchange rates for the specified currencies using get
-    response = requests.get(f"https://api.exchangerate-api.com/v4/latest/USD")
-    rates = response.json().get('rates', {}) # Returns the rates, or an empty dictionary if the rates field is missing
+    from ExchangeCore import get_client # Only the API input needs requests
+
+    # Fetch the latest exchange rates for the specified currencies, with timeouts and retries
+    rates = get_client().get_rates('USD') # Returns the rates, or an empty dictionary if the rates field is missing
 
     # Creates and returns a matrix of the currency rates from the requested currencies
     matrix = [[1 if i == j else rates[currencies[j]] / rates[currencies[i]] for j in range(len(currencies))] for i in range(len(currencies))]
@@ -91,18 +93,16 @@ def get_exchange_rates_from_input():
     return currencies, matrix
 
 # Create a graph from a matrix and list of currencies
-def build_graph(currencies, matrix):
+def build_graph(currencies, matrix, ask=None, fees=None):
     # Create a graph
     graph = Graph(currencies)
 
-    # Fill the graph with the matrix values
-    n = len(currencies)
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                rate = matrix[i][j]
-                weight = -math.log10(rate) # using the negative logarithm
-                graph.add_edge(i, j, weight)
+    from RateGraph import edge_arrays # numpy is only imported once a graph is built
+
+    # Negative logarithm of the executable rates, with the spread and fees already folded in,
+    # skipping the diagonal and missing rates
+    starts, destinations, weights = edge_arrays(matrix, ask, fees)
+    graph.add_edges(starts.tolist(), destinations.tolist(), weights.tolist())
 
     return graph
 
@@ -116,25 +116,25 @@ def find_arbitrage(graph, currencies):
 
 # Get the input type
 def input_type():
-    print('input type?')
-    print('1. API')
-    print('2. Custom')
-    print('3. Demo')
-    choice = input('Choose input type (1, 2 or 3): ')
-
-    # Return the appropriate string
-    if choice == '1':
-        print('API chosen')
-        return 'API'
-    elif choice == '2':
-        print('Custom chosen')
-        return 'Custom'
-    elif choice == '3':
-        print('Demo Chosen')
-        return 'Demo'
-    else:
-        print('Invalid choice. Try again.')
-        return input_type()
+    while True:
+        print('input type?')
+        print('1. API')
+        print('2. Custom')
+        print('3. Demo')
+        choice = input('Choose input type (1, 2 or 3): ')
+
+        # Return the appropriate string
+        if choice == '1':
+            print('API chosen')
+            return 'API'
+        elif choice == '2':
+            print('Custom chosen')
+            return 'Custom'
+        elif choice == '3':
+            print('Demo Chosen')
+            return 'Demo'
+        else:
+            print('Invalid choice. Try again.')
 
 def build_demo_graph():
     graph = Graph(6)
@@ -152,33 +152,34 @@ def build_demo_graph():
 
 
 def main():
-    # Get input choice
-    input_choice = input_type()
-
-    # Get currencies and matrix dependent on the chosen input
-    if input_choice == 'API':
-        currencies = [currency.strip() for currency in input("Enter currencies (comma-separated): ").split(',')]
-        matrix = fetch_exchange_rates(currencies)
-
-        # Print the exchange rate matrix
-        print("Exchange Rate Matrix:")
-        for row in matrix:
-            print(" ".join(f"{rate:.4f}" for rate in row))
-        graph = build_graph(currencies, matrix)  # Build graph
-    elif input_choice == 'Custom':
-        currencies, matrix = get_exchange_rates_from_input()
-        graph = build_graph(currencies, matrix)  # Build graph
-    else:
-        graph = build_demo_graph()
-        currencies = ['USD','NZD','DNR','HER','ABC', 'ADS']
-
-    print('Detecting arbitrage opportunities...')
-    find_arbitrage(graph, currencies) # Run arbitrage program
-    
-    input = input('Would you like to continue? Y/N')
-
-    if input == 'Y':
-        main()
+    while True:
+        # Get input choice
+        input_choice = input_type()
+
+        # Get currencies and matrix dependent on the chosen input
+        if input_choice == 'API':
+            currencies = [currency.strip() for currency in input("Enter currencies (comma-separated): ").split(',')]
+            matrix = fetch_exchange_rates(currencies)
+
+            # Print the exchange rate matrix
+            print("Exchange Rate Matrix:")
+            for row in matrix:
+                print(" ".join(f"{rate:.4f}" for rate in row))
+            graph = build_graph(currencies, matrix)  # Build graph
+        elif input_choice == 'Custom':
+            currencies, matrix = get_exchange_rates_from_input()
+            graph = build_graph(currencies, matrix)  # Build graph
+        else:
+            graph = build_demo_graph()
+            currencies = ['USD','NZD','DNR','HER','ABC', 'ADS']
+
+        print('Detecting arbitrage opportunities...')
+        find_arbitrage(graph, currencies) # Run arbitrage program
+
+        answer = input('Would you like to continue? Y/N')
+
+        if answer != 'Y':
+            break
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,220 @@
+import numpy as np
+
+
+class CurrencyUniverse:
+    """
+    The set of tracked currencies and the rates between them, for any number of currencies.
+
+    Currencies are numbered 0..n-1 in the order they were added, and rates[i, j] is the rate from codes[i]
+    to codes[j] (NaN when missing, 1 on the diagonal). The matrix lives in a preallocated buffer that grows
+    by doubling, so adding a currency only fills one row and column, and removing one moves the last
+    currency into its place instead of rebuilding the matrix.
+
+    A graph can be attached to be kept in sync edge by edge. It needs add_vertex(), remove_vertex(v),
+    set_edge(start, destination, weight) and remove_edge(start, destination), with weights -log10(rate).
+
+    Args:
+        codes (list): Initial currency codes.
+        capacity (int): Number of currencies to allocate room for up front.
+    """
+    def __init__(self, codes=(), capacity=8):
+        self.codes = []
+        self.index = {} # Currency code -> row/column in the matrix
+        self.graphs = []
+        self._rates = self._empty(capacity)
+        for code in codes:
+            self.add(code)
+
+    @classmethod
+    def from_matrix(cls, codes, matrix):
+        """
+        Create a universe from a list of currency codes and a rate matrix in the same order.
+        Non-positive rates are treated as missing.
+        """
+        universe = cls(capacity=max(8, len(codes)))
+        for code in codes:
+            universe.add(code)
+        matrix = np.array(matrix, dtype=float)
+        off_diagonal = ~np.eye(len(codes), dtype=bool)
+        universe.rates[off_diagonal] = np.where(matrix > 0, matrix, np.nan)[off_diagonal]
+        return universe
+
+    @staticmethod
+    def _empty(capacity):
+        rates = np.full((capacity, capacity), np.nan)
+        np.fill_diagonal(rates, 1.0)
+        return rates
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.index
+
+    def __iter__(self):
+        return iter(self.codes)
+
+    def __repr__(self):
+        return f"CurrencyUniverse({self.codes})"
+
+    @property
+    def rates(self):
+        """
+        The n×n rate matrix. This is a view of the buffer, valid until the next add or remove.
+        """
+        n = len(self.codes)
+        return self._rates[:n, :n]
+
+    def indices(self, codes):
+        """
+        Index array of the given currency codes, for selecting rows and columns of the matrix.
+        """
+        return np.fromiter((self.index[code] for code in codes), dtype=np.intp, count=len(codes))
+
+    def add(self, code, rates_from=None, rates_to=None):
+        """
+        Add a currency. Does nothing if it is already tracked.
+
+        Args:
+            code (str): Currency code.
+            rates_from (dict): Rates from the new currency to tracked currencies.
+            rates_to (dict): Rates from tracked currencies to the new currency.
+
+        Returns:
+            int: Index of the currency.
+        """
+        if code in self.index:
+            return self.index[code]
+
+        n = len(self.codes)
+        if n == len(self._rates):
+            # Out of room, double the buffer so adds stay cheap on average
+            rates = self._empty(2 * n)
+            rates[:n, :n] = self._rates
+            self._rates = rates
+
+        self.codes.append(code)
+        self.index[code] = n
+        for graph in self.graphs:
+            graph.add_vertex()
+
+        self.update({code: rates_from or {}})
+        self.update({base: {code: rate} for base, rate in (rates_to or {}).items()})
+        return n
+
+    def remove(self, code):
+        """
+        Stop tracking a currency. The last currency takes its index.
+        """
+        i = self.index.pop(code)
+        last = len(self.codes) - 1
+        moved = self.codes.pop()
+
+        if i != last:
+            self.codes[i] = moved
+            self.index[moved] = i
+            # Move the last row and column into the gap; the diagonal ends up as rates[last, last] = 1
+            self._rates[i, :last + 1] = self._rates[last, :last + 1]
+            self._rates[:last + 1, i] = self._rates[:last + 1, last]
+
+        self._rates[last, :] = np.nan
+        self._rates[:, last] = np.nan
+        self._rates[last, last] = 1.0
+
+        for graph in self.graphs:
+            graph.remove_vertex(i)
+
+    def clear(self):
+        for code in list(reversed(self.codes)):
+            self.remove(code)
+
+    def update(self, exchange_rates):
+        """
+        Set rates from a nested dictionary, exchange_rates[base][currency] = rate.
+        Currencies that are not tracked are ignored.
+
+        Returns:
+            int: Number of rates that changed.
+        """
+        cells = [(self.index[base], self.index[currency], rate)
+                 for base, rates in exchange_rates.items() if base in self.index
+                 for currency, rate in rates.items() if currency in self.index and currency != base]
+        if not cells:
+            return 0
+
+        rows, columns, values = zip(*cells)
+        rows = np.array(rows, dtype=np.intp)
+        columns = np.array(columns, dtype=np.intp)
+        values = np.array(values, dtype=float)
+
+        changed = ~np.isclose(self._rates[rows, columns], values, rtol=0.0, atol=0.0, equal_nan=True)
+        rows, columns, values = rows[changed], columns[changed], values[changed]
+        self._rates[rows, columns] = values
+        self._sync_edges(rows, columns, values)
+        return len(values)
+
+    def _sync_edges(self, rows, columns, values):
+        if not self.graphs:
+            return
+        usable = np.isfinite(values) & (values > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = -np.log10(values)
+        for graph in self.graphs:
+            for i, j, weight, ok in zip(rows.tolist(), columns.tolist(), weights.tolist(), usable.tolist()):
+                if ok:
+                    graph.set_edge(i, j, weight)
+                else:
+                    graph.remove_edge(i, j)
+
+    def attach(self, graph):
+        """
+        Fill a graph with the current currencies and rates and keep it in sync with later changes.
+        """
+        for _ in range(len(self.codes) - graph.no_vertices):
+            graph.add_vertex()
+        self.graphs.append(graph)
+
+        rows, columns = np.nonzero(~np.eye(len(self.codes), dtype=bool))
+        self._sync_edges(rows, columns, self.rates[rows, columns])
+        return graph
+
+    def to_dict(self):
+        """
+        The rates as a nested dictionary, the format the dictionary based code works with.
+        """
+        rates = self.rates
+        return {base: {currency: float(rates[i, j]) for j, currency in enumerate(self.codes)
+                       if i != j and not np.isnan(rates[i, j])}
+                for i, base in enumerate(self.codes)}
+
+
+# Example usage: grow to 160 currencies and shrink back, keeping a graph in sync
+if __name__ == "__main__":
+    import time
+
+    from CurrencyExchangeMerged import Graph, build_graph
+
+    rng = np.random.default_rng(0)
+    codes = [f"C{i:03d}" for i in range(160)]
+    per_usd = dict(zip(codes, rng.uniform(0.5, 150, len(codes))))
+
+    universe = CurrencyUniverse()
+    graph = universe.attach(Graph(0))
+    start = time.perf_counter()
+    for code in codes:
+        universe.add(code,
+                     {other: per_usd[other] / per_usd[code] for other in universe.codes},
+                     {other: per_usd[code] / per_usd[other] for other in universe.codes})
+    print(f"Added {len(universe)} currencies one by one in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for code in codes[::3]:
+        universe.remove(code)
+    print(f"Removed every third currency, {len(universe)} left, {len(graph.edges)} edges")
+
+    # The incrementally maintained graph matches one built from scratch
+    rebuilt = build_graph(universe.codes, universe.rates)
+    assert graph.no_vertices == rebuilt.no_vertices == len(universe)
+    assert {(e.start, e.destination): round(e.weight, 12) for e in graph.edges} == \
+           {(e.start, e.destination): round(e.weight, 12) for e in rebuilt.edges}
+    assert universe.to_dict()[universe.codes[0]][universe.codes[1]] == universe.rates[0, 1]
+    print("Graph matches a full rebuild")
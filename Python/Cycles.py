@@ -0,0 +1,184 @@
+import heapq
+from collections import OrderedDict
+from decimal import Decimal, localcontext
+from fractions import Fraction
+
+
+def canonical_cycle(cycle):
+    """
+    Give every rotation of the same cycle one identity.
+
+    Args:
+        cycle (list): A closed cycle, where the first and last node are the same, e.g. [B, C, A, B].
+
+    Returns:
+        tuple: The closed cycle rotated to start at its lexicographically smallest rotation, e.g. (A, B, C, A).
+    """
+    nodes = list(cycle[:-1]) if len(cycle) > 1 and cycle[0] == cycle[-1] else list(cycle)
+    if not nodes:
+        return ()
+
+    best = min(nodes[i:] + nodes[:i] for i in range(len(nodes)))
+    return tuple(best) + (best[0],)
+
+
+def top_k_cycles(candidates, k):
+    """
+    Deduplicate candidate cycles and return the k most profitable, best first.
+
+    Args:
+        candidates (iterable): (cycle, log_gain) pairs. Rotations of the same cycle are counted once.
+        k (int): Maximum number of cycles to keep.
+
+    Yields:
+        tuple: (canonical cycle, log_gain) in descending order of log_gain.
+    """
+    if k <= 0:
+        return
+
+    seen = set()
+    heap = [] # Min-heap of the k best so far, so the weakest is always at heap[0]
+
+    for order, (cycle, log_gain) in enumerate(candidates):
+        key = canonical_cycle(cycle)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        # Ties keep the cycle that was found first
+        entry = (log_gain, -order, key)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    heap.sort(reverse=True)
+    for log_gain, _, key in heap:
+        yield key, log_gain
+
+
+def predecessor_cycle(predecessor, nodes):
+    """
+    Look for a cycle in a Bellman-Ford predecessor graph.
+
+    During Bellman-Ford, a cycle of predecessor links can only form around a negative cycle, so finding
+    one confirms an arbitrage without finishing the remaining passes. Each node is visited once.
+
+    Args:
+        predecessor (list or dict): predecessor[node] is the previous node, or None / -1 if there is none.
+        nodes (iterable): All the nodes.
+
+    Returns:
+        list: The closed cycle in edge order, e.g. [A, B, C, A], or None if there is no cycle.
+    """
+    walk_of = {} # Node -> the walk that first reached it
+    for walk, node in enumerate(nodes):
+        path = []
+        while node is not None and node != -1 and node not in walk_of:
+            walk_of[node] = walk
+            path.append(node)
+            node = predecessor[node]
+
+        # Reaching a node of the current walk again closes a cycle
+        if node is not None and node != -1 and walk_of[node] == walk:
+            cycle = path[path.index(node):] + [node]
+            cycle.reverse() # The walk followed the edges backwards
+            return cycle
+
+    return None
+
+
+def exact_gain(cycle_rates, precision=28):
+    """
+    Recompute the gain of a candidate cycle from its raw rates, without float or display rounding.
+
+    Args:
+        cycle_rates (iterable): The rates along the cycle as the source gave them (str, int, float or Decimal),
+            or as exact Fractions. Floats are read by their shortest repr, which is the decimal the rate was parsed from.
+        precision (int): Significant digits for decimal.Decimal arithmetic, or None for exact Fraction arithmetic.
+
+    Returns:
+        Decimal or Fraction: The product of the rates minus 1, positive only if the cycle is profitable.
+    """
+    if precision is None:
+        product = Fraction(1)
+        for rate in cycle_rates:
+            product *= rate if isinstance(rate, Fraction) else Fraction(str(rate))
+        return product - 1
+
+    with localcontext() as context:
+        context.prec = precision
+        product = Decimal(1)
+        for rate in cycle_rates:
+            if isinstance(rate, Fraction):
+                product *= Decimal(rate.numerator) / Decimal(rate.denominator)
+            else:
+                product *= Decimal(str(rate))
+        return product - 1
+
+
+class ArbitrageSet:
+    """
+    Collection of arbitrage cycles with set membership and stable insertion order.
+
+    Cycles are stored by their canonical identity, so rotations of the same cycle are one entry.
+    """
+    NEW = 'new'
+    STILL_OPEN = 'still open'
+
+    def __init__(self):
+        self._cycles = {} # canonical cycle -> status, dicts keep insertion order
+
+    def add(self, cycle, status=NEW):
+        """
+        Add a cycle if it is not already present. Returns True if it was added.
+        """
+        key = canonical_cycle(cycle)
+        if key in self._cycles:
+            return False
+        self._cycles[key] = status
+        return True
+
+    def status(self, cycle):
+        return self._cycles[canonical_cycle(cycle)]
+
+    def clear(self):
+        self._cycles.clear()
+
+    def __contains__(self, cycle):
+        return canonical_cycle(cycle) in self._cycles
+
+    def __iter__(self):
+        return iter(self._cycles)
+
+    def __len__(self):
+        return len(self._cycles)
+
+    def __repr__(self):
+        return f"ArbitrageSet({list(self._cycles)})"
+
+
+class CycleMemory:
+    """
+    Bounded least-recently-used memory of cycles seen in earlier runs.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._seen = OrderedDict()
+
+    def touch(self, cycle):
+        """
+        Record a detection of the cycle. Returns True if it was already remembered from an earlier run.
+        """
+        key = canonical_cycle(cycle)
+        if key in self._seen:
+            self._seen.move_to_end(key)
+            return True
+
+        self._seen[key] = None
+        if len(self._seen) > self.max_size:
+            self._seen.popitem(last=False) # Forget the least recently detected cycle
+        return False
+
+    def __len__(self):
+        return len(self._seen)
@@ -0,0 +1,155 @@
+import numpy as np
+
+
+class Detector:
+    """
+    Reusable arbitrage detector for a fixed currency universe.
+
+    All the buffers the Bellman-Ford passes need are allocated once, sized to the number of
+    currencies, and reset in place on every run, so a polling loop does not allocate in steady state.
+    """
+    INF = float('inf')
+
+    def __init__(self, currencies, tolerance=1e-12):
+        self.currencies = list(currencies)
+        self.tolerance = tolerance # Ignore improvements smaller than float rounding noise
+        n = len(self.currencies)
+        self.no_vertices = n
+
+        self.weights = np.empty((n, n))         # Negative log10 of the rates
+        self.incoming = np.empty((n, n))        # weights transposed: incoming[v][u] = weight[u][v]
+        self.usable = np.empty((n, n), bool)    # Positive, quoted rates
+        self.off_diagonal = ~np.eye(n, dtype=bool)
+        self.candidates = np.empty((n, n))      # candidates[v][u] = distance[u] + weight[u][v]
+        self.distance = np.empty(n)
+        self.predecessor = np.empty(n, np.intp)
+        self.best = np.empty(n)
+        self.best_from = np.empty(n, np.intp)
+        self.limit = np.empty(n)
+        self.improved = np.empty(n, bool)
+
+        self.found = False
+        self.arbitrage = None # Currency cycle from the last run, if any
+
+    def load(self, snapshot):
+        """
+        Convert a rate matrix into edge weights in place, masking the diagonal and missing or non-positive rates.
+        """
+        np.greater(snapshot, 0, out=self.usable) # NaN compares False
+        np.logical_and(self.usable, self.off_diagonal, out=self.usable)
+        self.weights.fill(self.INF)
+        np.log10(snapshot, out=self.weights, where=self.usable)
+        np.negative(self.weights, out=self.weights, where=self.usable)
+        np.copyto(self.incoming, self.weights.T)
+
+    def relax(self):
+        """
+        One Bellman-Ford pass over every edge at once. Returns True if any distance improved.
+        """
+        # Broadcasting inside the add, or reducing across rows, would make numpy allocate an n * n
+        # scratch buffer; copying the distances in first and reducing along rows does not
+        np.copyto(self.candidates, self.distance)
+        np.add(self.candidates, self.incoming, out=self.candidates)
+        np.argmin(self.candidates, axis=1, out=self.best_from)
+        np.min(self.candidates, axis=1, out=self.best)
+        np.subtract(self.distance, self.tolerance, out=self.limit)
+        np.less(self.best, self.limit, out=self.improved)
+        if not self.improved.any():
+            return False
+
+        np.copyto(self.distance, self.best, where=self.improved)
+        np.copyto(self.predecessor, self.best_from, where=self.improved)
+        return True
+
+    def run(self, snapshot, source=None):
+        """
+        Detect an arbitrage cycle in a rate snapshot.
+
+        Args:
+            snapshot (numpy.ndarray): n * n float64 rate matrix in the detector's currency order.
+            source (int): Index of the starting currency. By default every currency is a source,
+                          so cycles anywhere in the graph are found.
+
+        Returns:
+            bool: True if an arbitrage was found. The cycle is stored in self.arbitrage.
+        """
+        self.load(snapshot)
+
+        # Reset the buffers in place
+        self.predecessor.fill(-1)
+        if source is None:
+            self.distance.fill(0) # Equivalent to a virtual source with a zero edge to every currency
+        else:
+            self.distance.fill(self.INF)
+            self.distance[source] = 0
+
+        # Relax all edges |V| - 1 times, stopping early once nothing changes
+        converged = False
+        for _ in range(self.no_vertices - 1):
+            if not self.relax():
+                converged = True
+                break
+
+        # Anything that still improves is on, or reachable from, a negative cycle
+        self.found = False
+        self.arbitrage = None
+        if converged or not self.relax():
+            return False
+
+        for node in np.flatnonzero(self.improved):
+            cycle = self._trace_cycle(int(node))
+            if cycle:
+                self.found = True
+                self.arbitrage = [self.currencies[i] for i in cycle]
+                break
+
+        return self.found
+
+    def _trace_cycle(self, node):
+        # Walk back |V| steps to be sure to land on the cycle
+        for _ in range(self.no_vertices):
+            node = int(self.predecessor[node])
+            if node < 0:
+                return []
+
+        cycle = [node]
+        current = int(self.predecessor[node])
+        while current != node:
+            cycle.append(current)
+            current = int(self.predecessor[current])
+        cycle.append(node)
+        cycle.reverse()
+        return cycle
+
+
+# Example usage: check that steady-state runs do not allocate
+if __name__ == "__main__":
+    import tracemalloc
+
+    n = 40
+    currencies = [f"C{i}" for i in range(n)]
+    per_usd = np.random.default_rng(1).uniform(0.5, 150, n) # Units of each currency per USD
+    snapshot = per_usd[None, :] / per_usd[:, None]           # Consistent cross rates, no arbitrage
+
+    detector = Detector(currencies)
+
+    tracemalloc.start()
+    for _ in range(1000): # Warm up numpy's internal caches while tracing
+        detector.run(snapshot)
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for _ in range(1000):
+        detector.run(snapshot)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Arbitrage found: {detector.found}")
+    print(f"Retained after 1000 runs: {after - before} bytes, peak: {peak - before} bytes")
+    # The peak is numpy's per-call bookkeeping, about 1 KiB whatever the number of currencies;
+    # a temporary the size of the matrix would be n * n * 8 = 12.8 KiB here
+    assert after - before < 100, "steady-state runs should not retain memory"
+    assert peak - before < 4096, "steady-state runs should not allocate matrix-sized temporaries"
+
+    snapshot[3, 4] *= 1.05 # Plant an arbitrage C3 -> C4 -> C3
+    detector.run(snapshot)
+    print(f"Arbitrage found: {detector.found} {' -> '.join(detector.arbitrage)}")
@@ -0,0 +1,450 @@
+"""
+Arbitrage detection engine shared by the GUI and the command line tools.
+
+Importing this module has no GUI side effects and does not import numpy or requests;
+they are imported by the functions that need them.
+"""
+import heapq
+from fractions import Fraction
+
+from Cycles import exact_gain, predecessor_cycle
+
+class Labels:
+    """ Class to store and manage label texts."""
+    def __init__(self):
+        self.path_info = "" # Best path label
+        self.arbitrage_info = "" # Arbitrage path and percentage gain label
+        self.version = None # Version of the rate snapshot the labels were computed from
+
+class BellmanFord:
+    """ Class to find arbitrage opportunities and shortest paths using the Bellman-Ford algorithm"""
+    INF = float('inf')
+
+    def __init__(self, ex, precision=28, check_every=None):
+        self.ex = ex
+        self.precision = precision # Digits used to verify a detected cycle, None for exact fractions
+        # Early exit mode: stop once a pass changes nothing, and every 'check_every' passes look for a cycle
+        # in the predecessor graph, stopping as soon as one is found
+        self.check_every = check_every
+        self.paths = None # ReweightedPaths from the last run, while it found no arbitrage
+        self.last_pair = None
+
+    def find_cached_path(self, start_currency, end_currency):
+        """
+        Answer a best path query from the last run, without running Bellman-Ford again.
+        Only valid while the rates are unchanged since that run.
+
+        Returns:
+            bool: True if the labels are up to date, False if a full run is needed.
+        """
+        if self.paths is not None and not self.paths.prepare():
+            self.paths = None # A cycle at full precision, only a full run can answer
+        if self.paths is None:
+            # With arbitrage the labels only hold for the pair they were computed for
+            return (start_currency, end_currency) == self.last_pair
+
+        self._show_path(self.paths.shortest_path(start_currency, end_currency), start_currency, end_currency)
+        self.last_pair = (start_currency, end_currency)
+        return True
+
+    def _show_path(self, shortest_path, start_currency, end_currency):
+        if shortest_path:
+            path_str = ' -> '.join(shortest_path)
+            self.ex.path_info = f"Path from {start_currency} to {end_currency}: {path_str}"
+        else:
+            self.ex.path_info = f"No path found from {start_currency} to {end_currency}."
+
+    def find_arbitrage_and_shortest_path(self, edges, start_currency, end_currency, rates, ask=None, fees=None):
+        """
+        Find arbitrage opportunities and the shortest path between two currencies.
+
+        Args:
+            edges (list of tuples): List of edges in the form (from_currency, to_currency, rate).
+            start_currency (str): The starting currency.
+            end_currency (str): The ending currency.
+            rates (dict): The exchange rates the edges were built from, used to report the gain.
+            ask (dict): The ask rates the edges were built from, if any (see create_graph_from_rates).
+            fees (float or dict): The fees the edges were built from, if any.
+        """
+
+        # Extract all unique nodes
+        nodes = set(u for u, _, _ in edges).union(v for _, v, _ in edges)
+        distance = {node: self.INF for node in nodes}
+        predecessor = {node: None for node in nodes}
+        distance[start_currency] = 0
+
+        # Relax all edges |V| - 1 times
+        cycle = None
+        for i in range(len(nodes) - 1):
+            changed = False
+            for u, v, w in edges:
+                if round(distance[u] + w, 3) < round(distance[v], 3):
+                    distance[v] = round(distance[u] + w, 3)
+                    predecessor[v] = u
+                    changed = True
+
+            if self.check_every:
+                if not changed:
+                    break # Converged, there is no negative cycle
+                if (i + 1) % self.check_every == 0:
+                    cycle = predecessor_cycle(predecessor, nodes)
+                    if cycle:
+                        break
+
+        # Check for negative weight cycles
+        arbitrage_found = cycle is not None
+        cycle_start = None
+
+        for u, v, w in edges:
+            if arbitrage_found: # Already found in the predecessor graph
+                break
+            if round(distance[u] + w, 3) < round(distance[v], 3):
+                arbitrage_found = True
+                cycle_start = v
+                break
+
+        # Without arbitrage later queries can use Dijkstra instead
+        self.last_pair = (start_currency, end_currency)
+        self.paths = None if arbitrage_found else ReweightedPaths(edges)
+
+        if arbitrage_found:
+            if cycle is None:
+                # If there is an arbitrage, trace the path using predecessors
+                cycle = []
+                current = cycle_start
+
+                # Find the cycle starting point
+                for _ in range(len(nodes)):
+                    current = predecessor[current]
+
+                cycle_start = current
+
+                # Trace back to find the complete cycle
+                while True:
+                    cycle.append(current)
+                    current = predecessor[current]
+                    if current == cycle_start:
+                        cycle.append(current)
+                        break
+                cycle.reverse()
+
+            # The rounded weights only propose the cycle, its gain is verified from the raw rates after costs
+            path = ' -> '.join(cycle)
+            gain = exact_gain((executable_rate(rates, cycle[i], cycle[i + 1], ask, fees) for i in range(len(cycle) - 1)),
+                              self.precision)
+
+            # Construct the output string labels
+            if gain > 0:
+                self.ex.arbitrage_info = (f"Arbitrage opportunity found: {path}\n"
+                                          f"Potential gain: {float(gain) * 100:.2f}%")
+                self.ex.path_info = "No path found. Due to arbitrage present."
+            else:
+                self.ex.arbitrage_info = (f"No arbitrage opportunity detected.\n"
+                                          f"{path} was rejected by exact verification ({float(gain) * 100:.4f}% after costs)")
+                self.ex.path_info = "No path found. The rounded rates contain a cycle that exact verification rejected."
+        else:
+            self.ex.arbitrage_info = "No arbitrage opportunity detected."
+
+            # Find the shortest path from start_currency to end_currency
+            self._show_path(self._reconstruct_path(predecessor, start_currency, end_currency), start_currency, end_currency)
+
+    def _reconstruct_path(self, predecessor, start_currency, end_currency):
+        """
+        Reconstruct the shortest path from start_currency to end_currency.
+
+        Args:
+            predecessor (dict): The predecessor map for path reconstruction.
+            start_currency (str): The starting currency.
+            end_currency (str): The ending currency.
+
+        Returns:
+            list: The list of currencies in the shortest path.
+        """
+
+        path = []
+        current = end_currency
+
+        while current is not None:
+            path.append(current)
+            current = predecessor[current]
+
+            if current == start_currency:
+                path.append(start_currency)
+                break
+            if len(path) > len(predecessor):  # Detect a possible cycle or infinite loop
+                return []  # No valid path found
+
+        path.reverse()
+        return path if path[0] == start_currency else []
+
+def executable_rate(rates, from_currency, to_currency, ask=None, fees=None):
+    """
+    The rate one conversion actually gets, with the spread and fees folded in the same way as
+    RateGraph.executable_rates does for the edge weights.
+
+    Returns:
+        The raw bid rate when there are no ask rates or fees, otherwise an exact Fraction.
+    """
+    def quote(table, u, v):
+        rate = table.get(u, {}).get(v) if table is not None else None
+        if rate is None or rate == 'N/A':
+            return None
+        rate = Fraction(str(rate))
+        return rate if rate > 0 else None
+
+    if ask is None and fees is None:
+        return rates[from_currency][to_currency]
+
+    # Selling from_currency at its bid, or buying to_currency with from_currency at 1 / ask, whichever is better
+    options = [quote(rates, from_currency, to_currency)]
+    reverse = quote(ask, to_currency, from_currency)
+    options.append(1 / reverse if reverse is not None else None)
+    rate = max(option for option in options if option is not None)
+
+    fee = fees.get(from_currency, {}).get(to_currency, 0) if isinstance(fees, dict) else (fees or 0)
+    return rate * (1 - Fraction(str(fee)))
+
+class ReweightedPaths:
+    """
+    Best conversion paths by Dijkstra, on edges reweighted with Johnson potentials.
+
+    The potentials h are Bellman-Ford distances from a virtual source joined to every currency by a
+    zero weight edge, computed on the weights as they are (without the detection run's rounding).
+    They satisfy h(v) <= h(u) + w(u, v) for every edge, so w(u, v) + h(u) - h(v) is never negative
+    and shortest paths stay the same. Each query is then O(E log V) instead of O(V E), and the
+    shortest path tree of every source is kept for later queries.
+
+    Args:
+        edges (list of tuples): Edges in the form (from_currency, to_currency, weight).
+    """
+    def __init__(self, edges):
+        self.edges = edges
+        self.adjacency = None # Reweighted edges, built on the first query
+        self.trees = {} # Source currency -> predecessor map of its shortest path tree
+
+    def prepare(self):
+        """
+        Compute the potentials and reweight the edges, once.
+
+        Returns:
+            bool: False if the weights contain a negative cycle, so there are no valid potentials.
+        """
+        if self.adjacency is not None:
+            return True
+
+        potential = {node: 0.0 for u, v, _ in self.edges for node in (u, v)}
+        for _ in range(len(potential)):
+            changed = False
+            for u, v, w in self.edges:
+                if potential[u] + w < potential[v]:
+                    potential[v] = potential[u] + w
+                    changed = True
+            if not changed:
+                break
+        else:
+            return False # Still relaxing after |V| passes
+
+        self.adjacency = {node: [] for node in potential}
+        for u, v, w in self.edges:
+            # Only float rounding of the sum can make this negative, by a few ulps
+            self.adjacency[u].append((v, max(0.0, w + potential[u] - potential[v])))
+        return True
+
+    def tree(self, source):
+        if source not in self.trees:
+            distance = {source: 0.0}
+            predecessor = {source: None}
+            heap = [(0.0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > distance[u]:
+                    continue # Stale entry
+                for v, w in self.adjacency[u]:
+                    if d + w < distance.get(v, float('inf')):
+                        distance[v] = d + w
+                        predecessor[v] = u
+                        heapq.heappush(heap, (d + w, v))
+            self.trees[source] = predecessor
+        return self.trees[source]
+
+    def shortest_path(self, start_currency, end_currency):
+        """
+        Returns:
+            list: The currencies on the best path from start_currency to end_currency, empty if there is none.
+        """
+        if not self.prepare() or start_currency not in self.adjacency:
+            return []
+        predecessor = self.tree(start_currency)
+        if end_currency not in predecessor:
+            return []
+
+        path = [end_currency]
+        while path[-1] != start_currency:
+            path.append(predecessor[path[-1]])
+        path.reverse()
+        return path
+
+# Shared HTTP client, created on first use so importing the core stays cheap
+_client = None
+
+def get_client():
+    """
+    Return the shared rate client, with pooled connections, timeouts, retries and a circuit breaker.
+    """
+    global _client
+    if _client is None:
+        from RateClient import RateClient
+        _client = RateClient()
+    return _client
+
+# Function to fetch exchange rates from the API
+def fetch_exchange_rates(currencies, exchange_rates, client=None):
+    """
+    Fetch live exchange rates for a list of currencies and store them in the given dictionary.
+
+    Args:
+        currencies (list): List of currency codes to fetch rates for.
+        exchange_rates (dict or RateBook): Where to store the rates, exchange_rates[from_currency] = {to_currency: rate}.
+        client (RateClient): Client to fetch with, defaults to the shared client.
+    """
+    import requests  # Only the live path needs requests
+
+    client = client or get_client()
+
+    # Fetch live exchange rates from API, one failing base currency doesn't stop the others
+    for base_currency in currencies:
+        try:
+            all_rates = client.get_rates(base_currency)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching exchange rates: {e}")
+            continue
+
+        # Filter rates to include only those in the 'currencies' list
+        filtered_rates = {currency: rate for currency, rate in all_rates.items() if
+                          currency in currencies and currency != base_currency}
+
+        exchange_rates[base_currency] = filtered_rates
+
+# Remembers the last rates detection ran on, created on first use since it needs numpy
+_refresh_gate = None
+
+def rates_changed(rates, context=None):
+    """
+    Check whether the rates differ from the ones detection last ran on.
+
+    Args:
+        rates (dict): Nested dictionary of exchange rates, from_currency -> {to_currency: rate}.
+        context: Anything else the result depends on, such as the selected currency pair.
+
+    Returns:
+        bool: False if the rates (within a small tolerance) and context are unchanged, so detection can be skipped.
+    """
+    global _refresh_gate
+    from RateGraph import rates_to_matrix
+    if _refresh_gate is None:
+        from RateDelta import RefreshGate
+        _refresh_gate = RefreshGate()
+
+    currencies, matrix = rates_to_matrix(rates)
+    return bool(_refresh_gate.update(currencies, matrix, context))
+
+def create_graph_from_rates(rates, ask=None, fees=None):
+    """
+    Create a negative logarithm graph representation of the exchange rates for use with the Bellman-Ford algorithm.
+
+    Args:
+        rates (dict): Nested dictionary of exchange (bid) rates, from_currency -> {to_currency: rate}.
+        ask (dict): Optional nested dictionary of ask rates in the same layout.
+        fees (float or dict): Optional proportional fee, either for every edge or as a nested dictionary per edge.
+
+    Returns:
+        list: Edges in the form (from_currency, to_currency, weight), with the spread and fees folded into the weight.
+    """
+    import numpy as np
+    from RateGraph import edge_list, rates_to_matrix
+
+    currencies, bid_matrix = rates_to_matrix(rates)  # Skip blanks
+    ask_matrix = rates_to_matrix(ask, currencies)[1] if ask is not None else None
+    if isinstance(fees, dict):
+        fees = np.nan_to_num(rates_to_matrix(fees, currencies)[1])
+
+    # Weights are rounded to 3 decimal places, like the rates shown in the matrix view
+    return edge_list(currencies, bid_matrix, ask_matrix, fees, decimals=3)
+
+
+# Example usage: repeated best path queries on rates without arbitrage
+if __name__ == "__main__":
+    import random
+    import time
+
+    random.seed(0)
+    currencies = [f"C{i}" for i in range(30)]
+    per_usd = {currency: random.uniform(0.5, 150) for currency in currencies}
+    # Cross rates less a random spread, so there is no arbitrage and indirect paths can beat direct ones
+    rates = {base: {currency: per_usd[currency] / per_usd[base] * random.uniform(0.95, 0.99)
+                    for currency in currencies if currency != base} for base in currencies}
+    edges = create_graph_from_rates(rates)
+    weights = {(u, v): w for u, v, w in edges}
+    pairs = [tuple(random.sample(currencies, 2)) for _ in range(100)]
+
+    def path_weight(label):
+        path = label.split(': ')[1].split(' -> ')
+        return sum(weights[(path[i], path[i + 1])] for i in range(len(path) - 1))
+
+    start = time.perf_counter()
+    full = []
+    for start_currency, end_currency in pairs:
+        ex = Labels()
+        BellmanFord(ex).find_arbitrage_and_shortest_path(edges, start_currency, end_currency, rates)
+        full.append(ex.path_info)
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ex = Labels()
+    bellman_ford = BellmanFord(ex)
+    bellman_ford.find_arbitrage_and_shortest_path(edges, *pairs[0], rates)
+    fast = []
+    for start_currency, end_currency in pairs:
+        assert bellman_ford.find_cached_path(start_currency, end_currency)
+        fast.append(ex.path_info)
+    fast_time = time.perf_counter() - start
+
+    # Bellman-Ford compares rounded distances, so ties may be broken differently but the costs agree
+    assert all(abs(path_weight(a) - path_weight(b)) < 0.005 for a, b in zip(full, fast))
+
+    # Dijkstra's paths are the true shortest paths of the weights, checked with plain unrounded Bellman-Ford
+    for (start_currency, end_currency), label in zip(pairs, fast):
+        distance = {currency: float('inf') for currency in currencies}
+        distance[start_currency] = 0.0
+        for _ in range(len(currencies) - 1):
+            for u, v, w in edges:
+                distance[v] = min(distance[v], distance[u] + w)
+        assert abs(path_weight(label) - distance[end_currency]) < 1e-9
+    print(f"{len(pairs)} queries: Bellman-Ford every time {full_time * 1000:.0f} ms, "
+          f"one Bellman-Ford then Dijkstra {fast_time * 1000:.0f} ms")
+
+    # Time to first cycle on a planted arbitrage, with and without the early exit mode
+    from CurrencyExchangeMerged import Graph
+
+    rates[currencies[3]][currencies[7]] *= 1.2
+    edges = create_graph_from_rates(rates)
+    for check_every in (None, 4):
+        ex = Labels()
+        start = time.perf_counter()
+        BellmanFord(ex, check_every=check_every).find_arbitrage_and_shortest_path(edges, currencies[0], currencies[1], rates)
+        print(f"Dictionary engine, check_every={check_every}: {(time.perf_counter() - start) * 1000:.1f} ms, "
+              f"{ex.arbitrage_info.splitlines()[0]}")
+
+    index = {currency: i for i, currency in enumerate(currencies)}
+    graph = Graph(len(currencies))
+    for u, v, w in edges:
+        graph.add_edge(index[u], index[v], w)
+    start = time.perf_counter()
+    found, _ = graph.bellman_ford(0)
+    full_time = time.perf_counter() - start
+    start = time.perf_counter()
+    cycle = graph.first_arbitrage(0)
+    early_time = time.perf_counter() - start
+    assert found and cycle
+    print(f"Graph engine: all passes {full_time * 1000:.1f} ms, early exit {early_time * 1000:.1f} ms, "
+          f"found {' -> '.join(currencies[i] for i in cycle)}")
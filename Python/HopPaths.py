@@ -0,0 +1,98 @@
+import numpy as np
+
+from MeanCycle import log_weight_matrix
+
+
+class HopLimitedPaths:
+    """
+    Best conversion from one currency to every other using at most k conversions.
+
+    Round h computes the lightest walk of exactly h edges to every currency with one vectorized
+    min-plus step over the -log10 weight matrix, and keeps that round's predecessors, so k rounds
+    cost O(k n^2) however long the unrestricted best path would be.
+
+    Args:
+        rates (array-like): n * n rate matrix, NaN or non-positive where there is no rate.
+        source (int): Index of the starting currency.
+        max_hops (int): Largest number of conversions to consider.
+    """
+    def __init__(self, rates, source, max_hops):
+        weights = log_weight_matrix(rates)
+        n = len(weights)
+        self.source = source
+        self.max_hops = max_hops
+
+        # exact[h][v]: lightest walk of exactly h edges from the source to v
+        self.exact = np.full((max_hops + 1, n), np.inf)
+        self.predecessor = np.full((max_hops + 1, n), -1, dtype=np.intp)
+        self.exact[0, source] = 0.0
+        for h in range(1, max_hops + 1):
+            candidates = self.exact[h - 1][:, None] + weights
+            self.predecessor[h] = np.argmin(candidates, axis=0)
+            self.exact[h] = candidates[self.predecessor[h], np.arange(n)]
+
+        # Best within a budget of h hops, and which exact length achieves it
+        self.best = np.minimum.accumulate(self.exact[1:], axis=0)
+        self.hops = np.empty_like(self.predecessor[1:])
+        for h in range(max_hops):
+            improved = self.exact[h + 1] < (self.best[h - 1] if h else np.inf)
+            self.hops[h] = np.where(improved, h + 1, self.hops[h - 1] if h else 1)
+
+    def best_rates(self, target):
+        """
+        The best rate from the source to target for every hop budget 1..max_hops, NaN where unreachable.
+        """
+        return np.where(np.isfinite(self.best[:, target]), np.power(10.0, -self.best[:, target]), np.nan)
+
+    def path(self, target, max_hops=None):
+        """
+        The best path from the source to target with at most max_hops conversions.
+
+        Args:
+            target (int): Index of the currency to reach.
+            max_hops (int): Hop budget from 1 to the max_hops the paths were computed for, defaults to that.
+
+        Returns:
+            list: Currency indices from the source to target, empty if target can't be reached in time.
+        """
+        if max_hops is None:
+            max_hops = self.max_hops
+        if not 1 <= max_hops <= self.max_hops:
+            raise ValueError(f"max_hops must be between 1 and {self.max_hops}, got {max_hops}")
+        budget = max_hops - 1
+        if not np.isfinite(self.best[budget, target]):
+            return []
+
+        path = [target]
+        for h in range(int(self.hops[budget, target]), 0, -1):
+            path.append(int(self.predecessor[h, path[-1]]))
+        path.reverse()
+        return path
+
+
+# Example usage: the trade-off between hops and rate, compared with an unrestricted run
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    n = 150
+    per_usd = rng.uniform(0.5, 150, n)
+    rates = per_usd[None, :] / per_usd[:, None] * rng.uniform(0.97, 0.999, (n, n))
+
+    start = time.perf_counter()
+    paths = HopLimitedPaths(rates, 0, 4)
+    hop_time = time.perf_counter() - start
+
+    # The same relaxation run for the full |V| - 1 rounds
+    start = time.perf_counter()
+    unrestricted = HopLimitedPaths(rates, 0, n - 1)
+    full_time = time.perf_counter() - start
+
+    target = 1
+    for hops, rate in enumerate(paths.best_rates(target), start=1):
+        path = paths.path(target, hops)
+        assert len(path) - 1 <= hops
+        assert np.isclose(np.prod([rates[path[i], path[i + 1]] for i in range(len(path) - 1)]), rate)
+        print(f"At most {hops} conversion(s): {rate:.6f} via {path}")
+    print(f"Unrestricted best: {unrestricted.best_rates(target)[-1]:.6f} via {unrestricted.path(target)}")
+    print(f"4 hop-limited rounds {hop_time * 1000:.1f} ms, all {n - 1} rounds {full_time * 1000:.1f} ms")
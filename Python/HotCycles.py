@@ -0,0 +1,112 @@
+import time
+
+from Cycles import canonical_cycle
+
+
+class HotCycles:
+    """
+    Cycles reported by the last full scan, rechecked first on every new snapshot.
+
+    Rechecking costs O(total cycle length), so an arbitrage that persists is reported again right away.
+    A full scan is only due when some edge weight moved by more than 'material_change' since the last
+    scan, edges appeared or disappeared, or 'scan_interval' seconds have passed.
+
+    Args:
+        material_change (float): Change in an edge weight (-log10 rate) that calls for a full scan.
+            1e-4 is about a 0.023% move in a rate.
+        scan_interval (float): Seconds after which a full scan is due anyway.
+        clock (callable): Time source, in seconds.
+    """
+    def __init__(self, material_change=1e-4, scan_interval=5.0, clock=time.monotonic):
+        self.material_change = material_change
+        self.scan_interval = scan_interval
+        self.clock = clock
+        self.cycles = []
+        self.scanned_weights = None # (start, destination) -> weight at the last full scan
+        self.last_scan = None
+
+    def recheck(self, weight_of):
+        """
+        Re-evaluate the hot cycles on the current weights, dropping the ones that closed.
+
+        Args:
+            weight_of (callable): weight_of(start, destination) -> edge weight, or None if the edge is gone.
+
+        Returns:
+            list: (cycle, log_gain) for every cycle that is still profitable.
+        """
+        still_open = []
+        for cycle in self.cycles:
+            total = 0.0
+            for i in range(len(cycle) - 1):
+                weight = weight_of(cycle[i], cycle[i + 1])
+                if weight is None:
+                    break
+                total += weight
+            else:
+                if total < 0:
+                    still_open.append((cycle, -total))
+
+        self.cycles = [cycle for cycle, _ in still_open]
+        return still_open
+
+    def scan_due(self, edges):
+        """
+        Whether the snapshot moved enough since the last full scan to need another one.
+
+        Args:
+            edges (iterable): Current (start, destination, weight) triples.
+        """
+        if self.last_scan is None or self.clock() - self.last_scan >= self.scan_interval:
+            return True
+
+        seen = 0
+        for start, destination, weight in edges:
+            seen += 1
+            previous = self.scanned_weights.get((start, destination))
+            if previous is None or abs(weight - previous) > self.material_change:
+                return True
+        return seen != len(self.scanned_weights)
+
+    def scanned(self, cycles, edges):
+        """
+        Record the result of a full scan and the weights it ran on.
+        """
+        self.cycles = [list(canonical_cycle(cycle)) for cycle in cycles]
+        self.scanned_weights = {(start, destination): weight for start, destination, weight in edges}
+        self.last_scan = self.clock()
+
+
+# Example usage: a persisting cycle is reported without a full scan on small moves
+if __name__ == "__main__":
+    import math
+    import random
+
+    from CurrencyExchangeMerged import Graph
+
+    random.seed(0)
+    n = 40
+    value = [random.uniform(0.5, 150) for _ in range(n)]
+    graph = Graph(n)
+    for u in range(n):
+        for v in range(n):
+            if u != v:
+                graph.add_edge(u, v, -math.log10(value[v] / value[u] * 0.999))
+    graph.set_edge(3, 7, -math.log10(value[7] / value[3] * 1.01))  # Planted arbitrage
+
+    hot = HotCycles(scan_interval=60.0)
+    start = time.perf_counter()
+    graph.scan_with_hot_cycles(hot)
+    print(f"First snapshot, full scan: {(time.perf_counter() - start) * 1000:.1f} ms, {hot.cycles}")
+
+    for tick in range(3):
+        for edge in graph.edges:
+            edge.weight += random.uniform(-1e-5, 1e-5) # Small moves only
+        reported = []
+        start = time.perf_counter()
+        scanned = graph.scan_with_hot_cycles(hot, report=lambda cycles: reported.append((time.perf_counter(), cycles)))
+        print(f"Tick {tick}: {len(reported[0][1])} cycle(s) reported after {(reported[0][0] - start) * 1e6:.0f} us, "
+              f"full scan {scanned}, done after {(time.perf_counter() - start) * 1e6:.0f} us")
+
+    graph.set_edge(3, 7, -math.log10(value[7] / value[3] * 0.999))  # The arbitrage closes
+    print(f"Closed: full scan {graph.scan_with_hot_cycles(hot)}, hot cycles {hot.cycles}")
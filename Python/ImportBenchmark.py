@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+# The importable detection core, and the heavy modules it used to pull in at import time
+CORE = "import ExchangeCore, CurrencyExchangeMerged, BellmanFord"
+EAGER = "import numpy, requests, tkinter; " + CORE
+
+
+def import_time(statement):
+    """
+    Run a statement in a fresh interpreter with -X importtime and return the total import time in microseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+
+    total = 0
+    for line in result.stderr.splitlines():
+        # Lines look like "import time:       123 |       4567 |   package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name[1:].startswith(" "): # Only count top-level imports, nested ones are in their cumulative time
+            total += int(cumulative)
+    return total
+
+
+def median_import_time(statement, runs=7):
+    times = sorted(import_time(statement) for _ in range(runs))
+    return times[len(times) // 2]
+
+
+if __name__ == "__main__":
+    startup = median_import_time("pass") # Interpreter startup (site etc.), the same for both
+    core = median_import_time(CORE) - startup
+    eager = median_import_time(EAGER) - startup
+    print(f"Core import (lazy numpy/requests/tkinter): {core / 1000:8.1f} ms")
+    print(f"Core import with eager heavy imports:      {eager / 1000:8.1f} ms")
+    print(f"Cold start is {eager / core:.1f}x faster")
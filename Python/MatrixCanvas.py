@@ -0,0 +1,150 @@
+import math
+import tkinter as tk
+from tkinter import ttk
+
+
+class MatrixView(tk.Frame):
+    """
+    Scrollable exchange rate matrix drawn on canvases.
+
+    Only the cells inside the visible window are drawn, and their canvas items are reused as the view
+    scrolls. A repaint only touches visible cells whose text changed since the last paint, and repaints
+    are batched with after_idle, so the cost stays the same however many currencies there are.
+
+    Args:
+        master (tk.Widget): Parent widget.
+        cell_width (int): Width of a cell in pixels.
+        cell_height (int): Height of a cell in pixels.
+        visible_cells (int): Number of rows/columns shown before scrolling.
+    """
+    def __init__(self, master, cell_width=110, cell_height=34, visible_cells=5, **kwargs):
+        super().__init__(master, **kwargs)
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.labels = []
+        self.values = []
+        self.paint_pending = False
+
+        self.corner = tk.Label(self, text="From/To", borderwidth=1, relief="solid")
+        self.column_headers = tk.Canvas(self, height=cell_height, width=cell_width * visible_cells, highlightthickness=0)
+        self.row_headers = tk.Canvas(self, width=cell_width, height=cell_height * visible_cells, highlightthickness=0)
+        self.body = tk.Canvas(self, width=cell_width * visible_cells, height=cell_height * visible_cells,
+                              background="white", highlightthickness=0)
+        x_scroll = ttk.Scrollbar(self, orient="horizontal", command=self.xview)
+        y_scroll = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.body.config(xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
+
+        self.corner.grid(row=0, column=0, sticky="nsew")
+        self.column_headers.grid(row=0, column=1, sticky="ew")
+        self.row_headers.grid(row=1, column=0, sticky="ns")
+        self.body.grid(row=1, column=1, sticky="nsew")
+        y_scroll.grid(row=1, column=2, sticky="ns")
+        x_scroll.grid(row=2, column=1, sticky="ew")
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(1, weight=1)
+
+        # Canvas items currently on screen, per canvas: (row, column) -> (rectangle, text), and the text painted in each
+        self.layers = {canvas: ({}, {}) for canvas in (self.body, self.row_headers, self.column_headers)}
+
+        self.body.bind("<Configure>", lambda event: self.schedule_paint())
+        self.body.bind("<MouseWheel>", lambda event: self.yview("scroll", -1 if event.delta > 0 else 1, "units"))
+        self.body.bind("<Button-4>", lambda event: self.yview("scroll", -1, "units"))
+        self.body.bind("<Button-5>", lambda event: self.yview("scroll", 1, "units"))
+
+    def xview(self, *args):
+        self.body.xview(*args)
+        self.column_headers.xview_moveto(self.body.xview()[0])
+        self.schedule_paint()
+
+    def yview(self, *args):
+        self.body.yview(*args)
+        self.row_headers.yview_moveto(self.body.yview()[0])
+        self.schedule_paint()
+
+    def set_data(self, labels, values):
+        """
+        Show a new matrix. Nothing is drawn until the next idle moment.
+
+        Args:
+            labels (list): Currency codes for the rows and columns.
+            values (list): values[i][j] is a rate, None for a missing rate, or a string to show as is.
+        """
+        if list(labels) != self.labels:
+            self.labels = list(labels)
+            width = self.cell_width * len(self.labels)
+            height = self.cell_height * len(self.labels)
+            self.body.config(scrollregion=(0, 0, width, height))
+            self.column_headers.config(scrollregion=(0, 0, width, self.cell_height))
+            self.row_headers.config(scrollregion=(0, 0, self.cell_width, height))
+            self.body.config(xscrollincrement=self.cell_width, yscrollincrement=self.cell_height)
+
+        self.values = values
+        self.schedule_paint()
+
+    def schedule_paint(self):
+        # Coalesce any number of updates into one repaint
+        if not self.paint_pending:
+            self.paint_pending = True
+            self.after_idle(self.paint)
+
+    @staticmethod
+    def format_value(value):
+        if isinstance(value, str):
+            return value
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return 'N/A'
+        return f"{value:.3f}"
+
+    def visible_range(self, offset, size, cell_size):
+        first = max(0, int(offset // cell_size))
+        last = min(len(self.labels), int(math.ceil((offset + size) / cell_size)))
+        return range(first, last)
+
+    def paint(self):
+        self.paint_pending = False
+        rows = self.visible_range(self.body.canvasy(0), self.body.winfo_height(), self.cell_height)
+        columns = self.visible_range(self.body.canvasx(0), self.body.winfo_width(), self.cell_width)
+
+        self.paint_layer(self.body, {(i, j): self.format_value(self.values[i][j]) for i in rows for j in columns})
+        self.paint_layer(self.column_headers, {(0, j): self.labels[j] for j in columns})
+        self.paint_layer(self.row_headers, {(i, 0): self.labels[i] for i in rows})
+
+    def paint_layer(self, canvas, cells):
+        """
+        Draw the given cells on a canvas, reusing the items of cells that scrolled out of view.
+
+        Args:
+            canvas (tk.Canvas): Canvas to draw on.
+            cells (dict): (row, column) -> text for every visible cell.
+        """
+        items, painted = self.layers[canvas]
+
+        # Items that are no longer visible are free to be moved to new cells
+        spare = [items.pop(key) for key in list(items) if key not in cells]
+        for key in list(painted):
+            if key not in items:
+                del painted[key]
+
+        for (i, j), text in cells.items():
+            if (i, j) not in items:
+                x, y = j * self.cell_width, i * self.cell_height
+                if spare:
+                    rectangle, label = spare.pop()
+                    canvas.coords(rectangle, x, y, x + self.cell_width, y + self.cell_height)
+                    canvas.coords(label, x + self.cell_width / 2, y + self.cell_height / 2)
+                    canvas.itemconfigure(rectangle, state="normal")
+                    canvas.itemconfigure(label, state="normal")
+                else:
+                    rectangle = canvas.create_rectangle(x, y, x + self.cell_width, y + self.cell_height, outline="black")
+                    label = canvas.create_text(x + self.cell_width / 2, y + self.cell_height / 2)
+                items[(i, j)] = (rectangle, label)
+
+            if painted.get((i, j)) != text:  # Only touch cells whose text changed
+                canvas.itemconfigure(items[(i, j)][1], text=text)
+                painted[(i, j)] = text
+
+        # Keep leftover items hidden for later reuse
+        for rectangle, label in spare:
+            canvas.itemconfigure(rectangle, state="hidden")
+            canvas.itemconfigure(label, state="hidden")
+            items[('spare', rectangle)] = (rectangle, label)
@@ -0,0 +1,236 @@
+import time
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class RateBook:
+    """
+    Exchange rates stored as arrays instead of nested dictionaries.
+
+    rates[i, j] is the rate from codes[i] to codes[j], valid[i, j] says whether that cell holds a live quote
+    and timestamps[i, j] when it was written (NaN if never). Invalid cells are NaN in the matrix, so engines
+    can use book.rates as it is, without a copy. The arrays are allocated once per set of currencies and
+    overwritten in place on every refresh.
+
+    Code written for the nested dictionaries can read the book through book.view, a read-only mapping
+    with the same layout, and write to it like a dictionary: book[base] = {currency: rate} replaces a row.
+
+    Args:
+        codes (list): Currency codes, in matrix order.
+    """
+    def __init__(self, codes=()):
+        self.codes = []
+        self.index = {} # Currency code -> row/column in the matrix
+        self.view = RatesView(self)
+        self._allocate(0)
+        self.set_codes(codes)
+
+    def _allocate(self, n):
+        self.rates = np.full((n, n), np.nan)
+        self.valid = np.zeros((n, n), dtype=bool)
+        self.timestamps = np.full((n, n), np.nan)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.index
+
+    def __repr__(self):
+        return f"RateBook({len(self.codes)} currencies, {int(np.count_nonzero(self.valid))} rates)"
+
+    def copy(self):
+        """
+        A writable copy of the book, with its own arrays.
+        """
+        book = RateBook()
+        book.codes, book.index = list(self.codes), dict(self.index)
+        book.rates, book.valid, book.timestamps = self.rates.copy(), self.valid.copy(), self.timestamps.copy()
+        return book
+
+    def freeze(self):
+        """
+        Make the arrays read-only, so any later write raises instead of changing rates under a reader.
+        """
+        for array in (self.rates, self.valid, self.timestamps):
+            array.setflags(write=False)
+        return self
+
+    def set_codes(self, codes):
+        """
+        Change the tracked currencies. Rates between currencies that stay are kept.
+        The arrays are only reallocated if the currencies actually change.
+        """
+        codes = list(codes)
+        if codes == self.codes:
+            return
+
+        old_index, old_arrays = self.index, (self.rates, self.valid, self.timestamps)
+        self.codes = codes
+        self.index = {code: i for i, code in enumerate(codes)}
+        self._allocate(len(codes))
+
+        kept = [(i, old_index[code]) for i, code in enumerate(codes) if code in old_index]
+        if kept:
+            new, old = (np.array(side, dtype=np.intp) for side in zip(*kept))
+            for array, old_array in zip((self.rates, self.valid, self.timestamps), old_arrays):
+                array[np.ix_(new, new)] = old_array[np.ix_(old, old)]
+
+    def set_row(self, base, rates, timestamp=None):
+        """
+        Replace every rate from one currency, as assigning exchange_rates[base] did.
+
+        Args:
+            base (str): Currency the rates are from.
+            rates (dict): currency -> rate. Untracked currencies are ignored; None, 'N/A' and non-positive
+                          rates leave the cell invalid.
+            timestamp (float): When the rates were quoted, defaults to now.
+        """
+        i = self.index[base]
+        columns, values = [], []
+        for currency, rate in rates.items():
+            j = self.index.get(currency)
+            if j is None or j == i or rate is None or rate == 'N/A':
+                continue
+            rate = float(rate)
+            if rate > 0 and rate != float('inf'):
+                columns.append(j)
+                values.append(rate)
+
+        self.rates[i] = np.nan
+        self.valid[i] = False
+        self.rates[i, columns] = values
+        self.valid[i, columns] = True
+        self.timestamps[i, columns] = time.time() if timestamp is None else timestamp
+
+    __setitem__ = set_row
+
+    def update(self, exchange_rates, timestamp=None):
+        """
+        Replace the rows of every base currency in a nested dictionary, like dict.update.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        for base, rates in exchange_rates.items():
+            if base in self.index:
+                self.set_row(base, rates, timestamp)
+
+    def load(self, matrix, timestamp=None):
+        """
+        Replace every rate from a matrix in codes order. NaN and non-positive rates are invalid.
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        with np.errstate(invalid='ignore'):
+            np.logical_and(matrix > 0, np.isfinite(matrix), out=self.valid)
+        np.fill_diagonal(self.valid, False)
+
+        self.rates.fill(np.nan)
+        np.copyto(self.rates, matrix, where=self.valid)
+        self.timestamps[self.valid] = time.time() if timestamp is None else timestamp
+
+    def expire(self, max_age, now=None):
+        """
+        Invalidate rates quoted more than max_age seconds ago.
+
+        Returns:
+            int: Number of rates that expired.
+        """
+        now = time.time() if now is None else now
+        stale = self.valid & (self.timestamps < now - max_age)
+        self.valid[stale] = False
+        self.rates[stale] = np.nan
+        return int(np.count_nonzero(stale))
+
+
+class RatesView(Mapping):
+    """
+    Read-only nested dictionary view of a RateBook: view[base][currency] is the rate, and only valid
+    rates appear. Reads go straight to the book's arrays, so the view is always current.
+    """
+    def __init__(self, book):
+        self.book = book
+
+    def __getitem__(self, base):
+        return RowView(self.book, self.book.index[base])
+
+    def __iter__(self):
+        return iter(self.book.codes)
+
+    def __len__(self):
+        return len(self.book.codes)
+
+
+class RowView(Mapping):
+    """
+    The rates from one currency of a RateBook, read-only.
+    """
+    def __init__(self, book, row):
+        self.book = book
+        self.row = row
+
+    def __getitem__(self, currency):
+        j = self.book.index[currency]
+        if not self.book.valid[self.row, j]:
+            raise KeyError(currency)
+        return float(self.book.rates[self.row, j])
+
+    def __iter__(self):
+        codes = self.book.codes
+        return (codes[j] for j in np.flatnonzero(self.book.valid[self.row]).tolist())
+
+    def __len__(self):
+        return int(np.count_nonzero(self.book.valid[self.row]))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+# Example usage: repeated refreshes of 150 currencies, compared with rebuilding nested dictionaries
+if __name__ == "__main__":
+    import tracemalloc
+
+    from RateGraph import rates_to_matrix
+
+    rng = np.random.default_rng(0)
+    codes = [f"C{i:03d}" for i in range(150)]
+    per_usd = rng.uniform(0.5, 150, len(codes))
+
+    def quotes():
+        rates = per_usd[None, :] / per_usd[:, None] * rng.uniform(0.99, 1.0, (len(codes), len(codes)))
+        return {base: {currency: float(rates[i, j]) for j, currency in enumerate(codes) if j != i}
+                for i, base in enumerate(codes)}
+
+    refreshes = [quotes() for _ in range(5)]
+    book = RateBook(codes)
+    book.update(refreshes[0])
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for refresh in refreshes * 4:
+        book.update(refresh)
+    book_time = (time.perf_counter() - start) / 20
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Refresh of {len(codes)} currencies: {book_time * 1000:.1f} ms, "
+          f"{current / 1024:.0f} KiB left allocated after 20 refreshes, peak {peak / 1024:.0f} KiB")
+
+    # Engines get the arrays themselves; legacy code reads the same cells through the view
+    currencies, matrix = rates_to_matrix(book.view)
+    assert matrix is book.rates and currencies == book.codes
+    nested = refreshes[-1]
+    assert dict(book.view['C007']) == nested['C007'] and book.view['C007']['C042'] == nested['C007']['C042']
+    assert book.view['C007'].get('C007', 'N/A') == 'N/A'
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        rates_to_matrix(book.view)
+    view_time = (time.perf_counter() - start) / 1000
+    start = time.perf_counter()
+    for _ in range(10):
+        rates_to_matrix(nested)
+    nested_time = (time.perf_counter() - start) / 10
+    print(f"Rate matrix for the engines: from the book {view_time * 1e6:.1f} us, from nested dictionaries {nested_time * 1000:.1f} ms")
+
+    # Rows not refreshed for a while drop out
+    book.set_row('C000', nested['C000'], timestamp=time.time() - 120)
+    print(f"Expired {book.expire(60)} rates older than a minute, {book!r}")
@@ -0,0 +1,242 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = "https://api.exchangerate-api.com/v4/latest/"
+
+
+class RateUnavailable(requests.exceptions.RequestException):
+    """ Raised when rates can't be fetched and there is no earlier good copy to fall back on."""
+
+
+class CircuitBreaker:
+    """
+    Stop calling an upstream that keeps failing, and let a single trial request through after a cool-down.
+
+    While half-open, only the caller that gets the trial is let through; everyone else is refused until
+    its outcome is recorded. The breaker is safe to share between threads.
+
+    Args:
+        failure_threshold (int): Consecutive failed fetches before the circuit opens.
+        reset_timeout (float): Seconds to wait while open before a trial request is allowed.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False # A trial request is in flight
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self.probing:
+                    return False # Wait for the trial request already in flight
+                self.probing = True # This caller makes the trial request
+                return True
+            return self.state == self.CLOSED
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+            self.probing = False
+
+
+class RateClient:
+    """
+    HTTP client for the exchange rate API.
+
+    Connections are pooled and kept alive in one requests.Session. Every request has a timeout, failed
+    requests are retried with exponential backoff and jitter, and while the circuit breaker is open the
+    last good rates for each base currency are served instead of waiting on the upstream.
+
+    Args:
+        base_url (str): URL the base currency code is appended to.
+        timeout (float or tuple): Per-request (connect, read) timeout in seconds.
+        retries (int): Extra attempts after a failed request.
+        backoff (float): Base delay in seconds, doubled on every retry.
+        max_backoff (float): Upper bound on a single delay.
+        breaker (CircuitBreaker): Circuit breaker to use, a default one is created if not given.
+        pool_size (int): Maximum number of pooled connections to keep.
+    """
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, timeout=(3.05, 5.0), retries=3, backoff=0.25, max_backoff=4.0,
+                 breaker=None, pool_size=10):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.last_good = {} # base currency -> last rates fetched successfully
+        self.last_good_at = {} # base currency -> when they were fetched
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def backoff_delay(self, attempt):
+        # Full jitter: a random delay up to the exponential bound, so clients don't retry in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def get_rates(self, base_currency):
+        """
+        Fetch all rates for a base currency.
+
+        Returns:
+            dict: Mapping of currency code to rate, possibly the last good copy if the upstream is down.
+
+        Raises:
+            RateUnavailable: If the fetch failed and no earlier rates are cached for this base currency.
+        """
+        base_currency = base_currency.strip()
+        try:
+            return self.get_fresh_rates(base_currency)
+        except RateUnavailable:
+            if base_currency in self.last_good:
+                return self.last_good[base_currency]
+            raise
+
+    def get_fresh_rates(self, base_currency):
+        """
+        Fetch all rates for a base currency, never falling back to the last good copy.
+
+        Raises:
+            RateUnavailable: If the fetch failed or the circuit is open.
+        """
+        base_currency = base_currency.strip()
+        if not self.breaker.allow_request():
+            raise RateUnavailable(f"Rates for {base_currency} unavailable: circuit open")
+
+        try:
+            rates, error = self._fetch(base_currency)
+        except Exception:
+            self.breaker.record_failure() # Never leave a trial request unresolved
+            raise
+        if rates is None:
+            self.breaker.record_failure()
+            raise RateUnavailable(f"Rates for {base_currency} unavailable: {error}")
+
+        self.breaker.record_success()
+        self.last_good[base_currency] = rates
+        self.last_good_at[base_currency] = time.time()
+        return rates
+
+    def _fetch(self, base_currency):
+        # The rates and None, or None and the last error once the retries are used up
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff_delay(attempt - 1))
+            try:
+                response = self.session.get(self.base_url + base_currency, timeout=self.timeout)
+                if response.status_code in self.RETRY_STATUSES:
+                    error = f"HTTP {response.status_code}"
+                    continue
+                response.raise_for_status()  # Other errors won't go away by retrying
+                rates = response.json().get('rates', {})
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+                continue
+            except (requests.exceptions.RequestException, ValueError) as e:
+                error = e
+                break
+            return rates, None
+
+        return None, error
+
+    def close(self):
+        self.session.close()
+
+
+# Example usage against a local stub server that injects latency and errors
+if __name__ == "__main__":
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    # Each request takes the next behaviour from the script: 'ok', 'error' or 'slow'
+    script = ['ok', 'error', 'error', 'ok', 'slow', 'slow', 'slow', 'error', 'error', 'error', 'ok']
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            behaviour = script.pop(0) if script else 'ok'
+            if behaviour == 'slow':
+                time.sleep(0.5)
+            if behaviour == 'error':
+                self.send_response(503)
+                self.end_headers()
+                return
+            body = json.dumps({'rates': {'USD': 1.0, 'EUR': 0.92, 'JPY': 149.5}}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except BrokenPipeError:
+                pass # The client already timed out
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = RateClient(f"http://127.0.0.1:{server.server_port}/", timeout=0.2, retries=2, backoff=0.01,
+                        breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.2))
+    print("ok:", client.get_rates('USD'))
+    print("two 503s then ok:", client.get_rates('USD'))
+    print("three timeouts, stale copy:", client.get_rates('USD'), client.breaker.state)
+    print("circuit open, stale copy without a request:", client.get_rates('USD'))
+    time.sleep(0.25)
+    print("trial request fails, stays open:", client.get_rates('USD'), client.breaker.state)
+    time.sleep(0.25)
+    print("recovered:", client.get_rates('USD'), client.breaker.state)
+
+    # Once the cool-down is over, only one of many concurrent callers gets the trial request
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.1)
+    barrier = threading.Barrier(8)
+    allowed = []
+
+    def caller():
+        barrier.wait()
+        allowed.append(breaker.allow_request())
+
+    callers = [threading.Thread(target=caller) for _ in range(8)]
+    for thread in callers:
+        thread.start()
+    for thread in callers:
+        thread.join()
+    print(f"half-open: {allowed.count(True)} of {len(allowed)} concurrent callers let through")
+    assert allowed.count(True) == 1 and not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.allow_request()
+
+    client.close()
+    server.shutdown()
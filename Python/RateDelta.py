@@ -0,0 +1,154 @@
+import numpy as np
+
+
+class Delta:
+    """
+    Compact difference between two rate matrices of the same shape: the flat indices of the changed cells and their new values.
+    """
+    def __init__(self, shape, indices, values):
+        self.shape = shape
+        self.indices = indices
+        self.values = values
+
+    def __bool__(self):
+        return len(self.indices) > 0
+
+    def __len__(self):
+        return len(self.indices)
+
+    @property
+    def nbytes(self):
+        return self.indices.nbytes + self.values.nbytes
+
+    def __repr__(self):
+        return f"Delta({len(self)} of {self.shape[0]}x{self.shape[1]} cells changed)"
+
+
+def diff(previous, current, rtol=1e-9, atol=0.0):
+    """
+    Compare two rate matrices cell by cell, within a tolerance.
+
+    Args:
+        previous (numpy.ndarray): The last rate matrix.
+        current (numpy.ndarray): The new rate matrix, the same shape as previous.
+        rtol (float): Relative tolerance, changes smaller than this are ignored.
+        atol (float): Absolute tolerance.
+
+    Returns:
+        Delta: The changed cells. Missing (NaN) rates only count as changed if they appear or disappear.
+    """
+    same = np.isclose(current, previous, rtol=rtol, atol=atol, equal_nan=True)
+    indices = np.flatnonzero(~same).astype(np.int32)
+    return Delta(current.shape, indices, current.ravel()[indices])
+
+
+def full_delta(matrix):
+    # Every cell changed, used for the first snapshot or when the currencies change
+    return Delta(matrix.shape, np.arange(matrix.size, dtype=np.int32), matrix.ravel().copy())
+
+
+def apply(matrix, delta):
+    """
+    Apply a delta to a matrix in place.
+    """
+    matrix.ravel()[delta.indices] = delta.values
+    return matrix
+
+
+class RefreshGate:
+    """
+    Decide whether a refresh changed anything, so the graph rebuild and Bellman-Ford can be skipped.
+
+    Args:
+        rtol (float): Relative tolerance for a rate to count as changed.
+        atol (float): Absolute tolerance.
+    """
+    def __init__(self, rtol=1e-9, atol=0.0):
+        self.rtol = rtol
+        self.atol = atol
+        self.currencies = None
+        self.context = None
+        self.previous = None
+
+    def update(self, currencies, matrix, context=None):
+        """
+        Record a new snapshot.
+
+        Args:
+            currencies (list): Currency order of the matrix.
+            matrix (numpy.ndarray): The new rate matrix.
+            context: Anything else the detection result depends on, such as the selected currency pair.
+
+        Returns:
+            Delta: The changes since the last snapshot, empty (falsy) if detection can be skipped.
+        """
+        if self.previous is None or list(currencies) != self.currencies or context != self.context:
+            self.currencies = list(currencies)
+            self.context = context
+            self.previous = np.array(matrix, dtype=float)
+            return full_delta(self.previous)
+
+        delta = diff(self.previous, matrix, self.rtol, self.atol)
+        apply(self.previous, delta)
+        return delta
+
+
+class DeltaHistory:
+    """
+    Rate history stored as one full matrix followed by deltas.
+    """
+    def __init__(self, currencies, matrix, timestamp):
+        self.currencies = list(currencies)
+        self.base = np.array(matrix, dtype=float)
+        self.latest = self.base.copy()
+        self.timestamps = [timestamp]
+        self.deltas = []
+
+    def append(self, matrix, timestamp, rtol=0.0, atol=0.0):
+        """
+        Store a new snapshot as its delta from the previous one. Returns the delta.
+        """
+        delta = diff(self.latest, matrix, rtol, atol)
+        apply(self.latest, delta)
+        self.deltas.append(delta)
+        self.timestamps.append(timestamp)
+        return delta
+
+    def at(self, i):
+        """
+        Rebuild the i-th stored snapshot.
+        """
+        matrix = self.base.copy()
+        for delta in self.deltas[:i]:
+            apply(matrix, delta)
+        return matrix
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def nbytes(self):
+        return self.base.nbytes + sum(delta.nbytes for delta in self.deltas)
+
+
+# Example usage: history of mostly unchanged refreshes
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    n = 50
+    per_usd = rng.uniform(0.5, 150, n)
+    matrix = per_usd[None, :] / per_usd[:, None]
+
+    history = DeltaHistory([f"C{i}" for i in range(n)], matrix, 0)
+    gate = RefreshGate()
+    gate.update(history.currencies, matrix)
+    skipped = 0
+    for t in range(1, 101):
+        if t % 10 == 0: # Every tenth refresh moves one currency
+            matrix = matrix.copy()
+            matrix[rng.integers(n), :] *= 1.001
+        history.append(matrix, t)
+        skipped += not gate.update(history.currencies, matrix)
+
+    assert np.array_equal(history.at(100), matrix)
+    print(f"Skipped detection on {skipped} of 100 refreshes")
+    print(f"History: {history.nbytes} bytes instead of {101 * matrix.nbytes} bytes for full copies")
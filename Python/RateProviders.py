@@ -0,0 +1,213 @@
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from RateClient import RateClient, RateUnavailable
+
+
+class Provider:
+    """
+    One source of exchange rates.
+
+    get_rates only returns rates fetched just now, so a provider that is down loses the race instead of
+    winning it with the last good copy its client keeps; that copy is available through stale_rates.
+
+    Args:
+        name (str): Name used in logs and results.
+        client (RateClient): Client configured with this provider's URL, timeouts and retries.
+    """
+    def __init__(self, name, client):
+        self.name = name
+        self.client = client
+
+    @classmethod
+    def from_url(cls, name, base_url, **client_options):
+        return cls(name, RateClient(base_url, **client_options))
+
+    def get_rates(self, base_currency):
+        return self.client.get_fresh_rates(base_currency)
+
+    def stale_rates(self, base_currency):
+        """
+        The last rates fetched successfully and when, or None.
+        """
+        base_currency = base_currency.strip()
+        if base_currency not in self.client.last_good:
+            return None
+        return self.client.last_good_at[base_currency], self.client.last_good[base_currency]
+
+
+class ProviderRace:
+    """
+    Fetch rates from several providers at once and use the fastest valid answers.
+
+    With quorum=1 the first valid response wins. With a larger quorum, responses are collected until
+    'quorum' have arrived or the deadline passes, and the median of each rate is used.
+    Requests still running when the answer is decided are abandoned. Only if no provider answers in time
+    is the most recent last good copy among the providers used instead.
+
+    Args:
+        providers (list): Providers to race.
+        deadline (float): Seconds to wait for responses per base currency.
+        quorum (int): Number of responses to combine with the median.
+    """
+    def __init__(self, providers, deadline=2.0, quorum=1):
+        self.providers = providers
+        self.deadline = deadline
+        self.quorum = min(quorum, len(providers))
+        self.executor = ThreadPoolExecutor(max_workers=4 * len(providers))
+        self.winners = {} # base currency -> names of the providers whose answers were used
+
+    def get_rates(self, base_currency):
+        """
+        Race the providers for one base currency.
+
+        Returns:
+            dict: Mapping of currency code to rate.
+
+        Raises:
+            RateUnavailable: If no provider answered before the deadline and none has an earlier copy.
+        """
+        end = time.monotonic() + self.deadline
+        pending = {self.executor.submit(provider.get_rates, base_currency): provider for provider in self.providers}
+        answers = []
+
+        while pending and len(answers) < self.quorum:
+            done, _ = wait(pending, timeout=max(0.0, end - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break # Deadline passed
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    rates = future.result()
+                except requests.exceptions.RequestException:
+                    continue
+                if rates:
+                    answers.append((provider.name, rates))
+
+        # Don't wait for the slower providers; anything not yet started is dropped
+        for future in pending:
+            future.cancel()
+
+        if not answers:
+            freshest = None
+            for provider in self.providers:
+                copy = provider.stale_rates(base_currency)
+                if copy is not None and (freshest is None or copy[0] > freshest[0]):
+                    freshest = (copy[0], copy[1], provider.name)
+            if freshest is not None:
+                self.winners[base_currency] = [f"{freshest[2]} (stale)"]
+                return freshest[1]
+            raise RateUnavailable(f"No provider answered for {base_currency} within {self.deadline}s")
+
+        self.winners[base_currency] = [name for name, _ in answers]
+        if len(answers) == 1:
+            return answers[0][1]
+        return median_rates([rates for _, rates in answers])
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for provider in self.providers:
+            provider.client.close()
+
+
+def median_rates(answers):
+    # Median of every currency quoted by at least one provider
+    currencies = set().union(*answers)
+    return {currency: statistics.median(rates[currency] for rates in answers if currency in rates)
+            for currency in currencies}
+
+
+def fetch_exchange_rates(currencies, exchange_rates, race):
+    """
+    Fetch rates for every base currency in parallel, each one raced across the providers.
+
+    Follows the same contract as ExchangeCore.fetch_exchange_rates: exchange_rates[base] = {currency: rate}
+    for the other requested currencies.
+    """
+    with ThreadPoolExecutor(max_workers=len(currencies) or 1) as pool:
+        results = dict(zip(currencies, pool.map(lambda base: _try_rates(race, base), currencies)))
+
+    for base_currency, all_rates in results.items():
+        if all_rates is None:
+            continue
+        exchange_rates[base_currency] = {currency: rate for currency, rate in all_rates.items() if
+                                         currency in currencies and currency != base_currency}
+
+
+def _try_rates(race, base_currency):
+    try:
+        return race.get_rates(base_currency)
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching exchange rates: {e}")
+        return None
+
+
+# Example usage with local stub providers of different latencies
+if __name__ == "__main__":
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    def stub_server(latency, eur):
+        class StubHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(latency)
+                if self.server.down:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps({'rates': {'USD': 1.0, 'EUR': eur, 'JPY': 149.5}}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except BrokenPipeError:
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        server.down = False
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    servers = [stub_server(0.3, 0.91), stub_server(0.05, 0.92), stub_server(0.1, 0.95)]
+    providers = [Provider.from_url(f"stub{i}", f"http://127.0.0.1:{server.server_port}/", retries=0)
+                 for i, server in enumerate(servers)]
+
+    for quorum in (1, 2, 3):
+        race = ProviderRace(providers, deadline=1.0, quorum=quorum)
+        start = time.perf_counter()
+        rates = race.get_rates('USD')
+        print(f"quorum={quorum}: EUR={rates['EUR']} from {race.winners['USD']} "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    exchange_rates = {}
+    fetch_exchange_rates(['USD', 'EUR'], exchange_rates, ProviderRace(providers, deadline=1.0))
+    print(exchange_rates)
+
+    # A fast provider that goes down must not keep winning with its last good rates
+    fast, live = stub_server(0.01, 0.50), stub_server(0.1, 0.92)
+    race = ProviderRace([Provider.from_url(name, f"http://127.0.0.1:{server.server_port}/", retries=0)
+                         for name, server in (('A', fast), ('B', live))], deadline=1.0)
+    print(f"A up: EUR={race.get_rates('USD')['EUR']} from {race.winners['USD']}")
+    fast.down = True
+    for _ in range(5): # Opens A's circuit after three failures
+        rates = race.get_rates('USD')
+        assert rates['EUR'] == 0.92 and race.winners['USD'] == ['B']
+    print(f"A down: EUR={rates['EUR']} from {race.winners['USD']}, A's circuit {race.providers[0].client.breaker.state}")
+    live.down = True
+    rates = race.get_rates('USD')
+    assert rates['EUR'] == 0.92 and race.winners['USD'] == ['B (stale)'] # B's copy is the most recent
+    print(f"Both down: EUR={rates['EUR']} from {race.winners['USD']}")
+    race.close()
+    servers += [fast, live]
+
+    for server in servers:
+        server.shutdown()
@@ -0,0 +1,291 @@
+import asyncio
+import json
+import time
+import urllib.parse
+import urllib.request
+
+from ExchangeCore import BellmanFord, Labels, create_graph_from_rates, fetch_exchange_rates
+from RateGraph import rates_to_matrix
+
+DEFAULT_PORT = 8765
+
+
+class RateService:
+    """
+    Local service that owns the rate fetch loop and shares the rates and arbitrage results with every client.
+
+    Endpoints (JSON over HTTP):
+        GET /snapshot?currencies=USD,EUR&since=3   Current rates. With 'since', waits until a newer version exists.
+        GET /arbitrage?currencies=...&from=USD&to=EUR   Arbitrage and best path, computed once per snapshot.
+        GET /stream                                Server-sent events, one 'snapshot' event per new version.
+
+    Args:
+        currencies (list): Currencies to fetch. Clients asking for others add them to the set; codes the
+                           upstream has no rates for are dropped again and the request is answered 400.
+        refresh_interval (float): Seconds between fetches.
+        fetch (callable): fetch(currencies, exchange_rates), defaults to ExchangeCore.fetch_exchange_rates.
+        publisher (RatePublisher): Also write every snapshot to this shared memory segment (see SharedRates.py).
+    """
+    LONG_POLL_TIMEOUT = 30.0
+
+    def __init__(self, currencies, refresh_interval=60.0, fetch=fetch_exchange_rates, publisher=None):
+        self.currencies = list(currencies)
+        self.refresh_interval = refresh_interval
+        self.fetch = fetch
+        self.publisher = publisher
+        self.version = 0
+        self.timestamp = None
+        self.exchange_rates = {}
+        self.fetched_currencies = [] # Currencies the last fetch attempt covered, whether it succeeded or not
+        self.results = {} # (version, currencies, from, to) -> arbitrage result
+        self.updated = None
+        self.refresh_now = None
+
+    async def refresh(self):
+        """
+        Fetch a new snapshot off the event loop and publish it.
+        """
+        currencies = list(self.currencies)
+        exchange_rates = {}
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.fetch, currencies, exchange_rates)
+        except Exception:
+            exchange_rates = {}
+            raise
+        finally:
+            self.fetched_currencies = currencies
+            if not exchange_rates:
+                async with self.updated:
+                    self.updated.notify_all() # Requests waiting on new currencies learn this fetch is over
+        if not exchange_rates:
+            return
+
+        # Swap in the complete snapshot, readers never see a half-filled one
+        self.exchange_rates = exchange_rates
+        self.timestamp = time.time()
+        self.version += 1
+        self.results.clear()
+        async with self.updated:
+            self.updated.notify_all()
+
+        if self.publisher is not None:
+            try:
+                self.publisher.publish(*rates_to_matrix(exchange_rates, list(self.currencies)), self.version, self.timestamp)
+            except ValueError as e:  # Too many currencies or an unusable code; HTTP clients are still served
+                print(f"Error publishing rates to shared memory: {e}")
+
+    async def fetch_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:  # Keep serving the last snapshot if a fetch fails
+                print(f"Error refreshing rates: {e}")
+            try:
+                await asyncio.wait_for(self.refresh_now.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.refresh_now.clear()
+
+    async def ensure_currencies(self, currencies):
+        """
+        Add any currency a client needs and wait for a fetch that includes it.
+
+        Returns:
+            list: The added currencies the fetch found no rates for. They are removed again, so an unknown
+                  code doesn't stay in every later fetch.
+        """
+        missing = [currency for currency in currencies if currency not in self.currencies]
+        if not missing:
+            return []
+        self.currencies.extend(missing)
+        await self.wait_until(lambda: all(currency in self.fetched_currencies for currency in missing),
+                              self.LONG_POLL_TIMEOUT, trigger=True)
+        rejected = [currency for currency in missing if currency not in self.exchange_rates]
+        self.currencies = [currency for currency in self.currencies if currency not in rejected]
+        return rejected
+
+    async def wait_for_version(self, since, timeout):
+        await self.wait_until(lambda: self.version > since, timeout)
+
+    async def wait_until(self, predicate, timeout, trigger=False):
+        async with self.updated:
+            if trigger:
+                self.refresh_now.set()
+            try:
+                await asyncio.wait_for(self.updated.wait_for(predicate), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def snapshot(self, currencies=None):
+        rates = self.exchange_rates
+        if currencies:
+            rates = {base: {currency: rate for currency, rate in rates[base].items() if currency in currencies}
+                     for base in currencies if base in rates}
+        return {'version': self.version, 'timestamp': self.timestamp, 'rates': rates}
+
+    async def arbitrage(self, currencies, start_currency, end_currency):
+        """
+        Arbitrage result for a set of currencies and a currency pair. Computed once per snapshot and shared.
+        """
+        snapshot = self.snapshot(currencies)
+        key = (snapshot['version'], tuple(currencies), start_currency, end_currency)
+        if key not in self.results:
+            # Store the pending future so concurrent requests for the same result share one computation
+            self.results[key] = asyncio.get_running_loop().run_in_executor(
+                None, detect, snapshot['rates'], start_currency, end_currency)
+        future = self.results[key]
+        try:
+            result = await future
+        except Exception:
+            # Don't keep serving a failure for the rest of this snapshot
+            if self.results.get(key) is future:
+                del self.results[key]
+            raise
+        return dict(result, version=snapshot['version'])
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass # Headers are not needed
+            if len(request_line) < 2 or request_line[0] != 'GET':
+                await self.respond(writer, 405, {'error': 'only GET is supported'})
+                return
+
+            url = urllib.parse.urlsplit(request_line[1])
+            query = dict(urllib.parse.parse_qsl(url.query))
+            currencies = [currency for currency in query.get('currencies', '').split(',') if currency]
+            rejected = await self.ensure_currencies(currencies)
+            if rejected:
+                await self.respond(writer, 400, {'error': f"no rates available for: {', '.join(rejected)}"})
+                return
+
+            if url.path == '/snapshot':
+                if 'since' in query:
+                    try:
+                        since = int(query['since'])
+                    except ValueError:
+                        await self.respond(writer, 400, {'error': f"invalid 'since': {query['since']}"})
+                        return
+                    await self.wait_for_version(since, self.LONG_POLL_TIMEOUT)
+                await self.respond(writer, 200, self.snapshot(currencies))
+            elif url.path == '/arbitrage':
+                currencies = currencies or self.currencies
+                start_currency, end_currency = query.get('from', currencies[0]), query.get('to', currencies[-1])
+                unknown = [currency for currency in (start_currency, end_currency) if currency not in currencies]
+                if unknown:
+                    await self.respond(writer, 400, {'error': f"not among the requested currencies: {', '.join(unknown)}"})
+                    return
+                missing = [currency for currency in (start_currency, end_currency) if currency not in self.exchange_rates]
+                if missing:
+                    await self.respond(writer, 503, {'error': f"no rates yet for: {', '.join(missing)}"})
+                    return
+                try:
+                    result = await self.arbitrage(currencies, start_currency, end_currency)
+                except Exception as e:
+                    print(f"Error detecting arbitrage: {e!r}")
+                    await self.respond(writer, 500, {'error': 'arbitrage detection failed'})
+                    return
+                await self.respond(writer, 200, result)
+            elif url.path == '/stream':
+                await self.stream(writer, currencies)
+            else:
+                await self.respond(writer, 404, {'error': 'not found'})
+        except (ConnectionError, ValueError) as e:
+            print(f"Error handling request: {e}")
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload):
+        body = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def stream(self, writer, currencies):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n\r\n")
+        version = 0
+        while True:
+            if self.version > version:
+                version = self.version
+                writer.write(f"event: snapshot\ndata: {json.dumps(self.snapshot(currencies))}\n\n".encode())
+                await writer.drain()
+            await self.wait_for_version(version, self.LONG_POLL_TIMEOUT)
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT):
+        self.updated = asyncio.Condition()
+        self.refresh_now = asyncio.Event()
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving rates on http://{host}:{server.sockets[0].getsockname()[1]}")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.fetch_loop())
+
+
+def detect(rates, start_currency, end_currency):
+    # The same detection the GUI runs locally
+    ex = Labels()
+    edges = create_graph_from_rates(rates)
+    BellmanFord(ex).find_arbitrage_and_shortest_path(edges, start_currency, end_currency, rates)
+    return {'arbitrage_info': ex.arbitrage_info, 'path_info': ex.path_info}
+
+
+class ServiceClient:
+    """
+    Thin client for a running RateService, used by the GUIs instead of fetching and detecting themselves.
+    """
+    def __init__(self, url=f"http://127.0.0.1:{DEFAULT_PORT}", timeout=35.0):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def get(self, path, **query):
+        query = {key: value for key, value in query.items() if value is not None}
+        with urllib.request.urlopen(f"{self.url}{path}?{urllib.parse.urlencode(query)}", timeout=self.timeout) as response:
+            return json.load(response)
+
+    def fetch_exchange_rates(self, currencies, exchange_rates):
+        """
+        Same contract as ExchangeCore.fetch_exchange_rates, served from the shared snapshot.
+        """
+        try:
+            snapshot = self.get('/snapshot', currencies=','.join(currencies))
+        except OSError as e:
+            print(f"Error fetching exchange rates: {e}")
+            return None
+        exchange_rates.update(snapshot['rates'])
+        return snapshot['version']
+
+    def find_arbitrage_and_shortest_path(self, ex, currencies, start_currency, end_currency):
+        """
+        Fill the labels with the shared detection result for these currencies.
+        """
+        try:
+            result = self.get('/arbitrage', currencies=','.join(currencies), **{'from': start_currency, 'to': end_currency})
+        except OSError as e:
+            print(f"Error fetching arbitrage results: {e}")
+            return
+        ex.arbitrage_info = result['arbitrage_info']
+        ex.path_info = result['path_info']
+        ex.version = result['version']
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve shared exchange rates and arbitrage results locally.")
+    parser.add_argument('currencies', nargs='*', default=['USD', 'NZD', 'AUD', 'EUR', 'JPY'])
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--interval', type=float, default=60.0, help="Seconds between fetches")
+    parser.add_argument('--shm', help="Also publish the rates in a shared memory segment with this name")
+    parser.add_argument('--capacity', type=int, default=64, help="Largest number of currencies in the segment")
+    args = parser.parse_args()
+
+    publisher = None
+    if args.shm:
+        from SharedRates import RatePublisher
+        publisher = RatePublisher(args.shm, args.capacity)
+    try:
+        asyncio.run(RateService(args.currencies, args.interval, publisher=publisher).serve(port=args.port))
+    finally:
+        if publisher is not None:
+            publisher.close()
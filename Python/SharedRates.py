@@ -0,0 +1,263 @@
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# Header fields, one int64 each
+SEQUENCE, VERSION, COUNT, CODES, CAPACITY, TIMESTAMP = range(6)
+HEADER_BYTES = 64
+CODE_DTYPE = 'S8'
+
+# Segments created by publishers in this process (or the process it was forked from)
+_published = set()
+
+
+def segment_size(capacity):
+    return HEADER_BYTES + capacity * np.dtype(CODE_DTYPE).itemsize + capacity * capacity * 8
+
+
+def map_segment(buffer, capacity):
+    # Header, currency codes and rate matrix laid out back to back in the segment
+    header = np.ndarray((6,), dtype=np.int64, buffer=buffer)
+    codes = np.ndarray((capacity,), dtype=CODE_DTYPE, buffer=buffer, offset=HEADER_BYTES)
+    rates = np.ndarray((capacity, capacity), dtype=np.float64, buffer=buffer,
+                       offset=HEADER_BYTES + codes.nbytes)
+    return header, codes, rates
+
+
+class RatePublisher:
+    """
+    Publish the current rate matrix in a shared memory segment that other processes on the machine can read.
+
+    The segment holds a header, up to 'capacity' currency codes and a capacity * capacity rate matrix.
+    Writes are guarded by a sequence counter (a seqlock): it is odd while a write is in progress and
+    even otherwise, so a reader that sees the same even value before and after reading knows it read
+    one complete snapshot. There must be only one publisher per segment.
+
+    Args:
+        name (str): Name of the segment, shared with the subscribers.
+        capacity (int): Largest number of currencies that can be published.
+    """
+    def __init__(self, name, capacity=64):
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=segment_size(capacity))
+        _published.add(self.shm._name)
+        self.header, self.codes, self.rates = map_segment(self.shm.buf, capacity)
+        self.header[:] = 0
+        self.header[CAPACITY] = capacity
+        self.rates[:] = np.nan
+        self._codes = []
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, codes, rates, version=None, timestamp=None):
+        """
+        Write a new snapshot.
+
+        Args:
+            codes (list): Currency codes, at most 8 ASCII characters each.
+            rates (array-like): len(codes) * len(codes) rate matrix, NaN where there is no rate.
+            version (int): Snapshot version, defaults to the previous one plus one.
+            timestamp (float): When the rates were quoted, defaults to now.
+        """
+        n = len(codes)
+        if n > self.capacity:
+            raise ValueError(f"{n} currencies don't fit in a segment for {self.capacity}")
+        changed = list(codes) != self._codes
+        if changed:
+            encoded = [code.encode('ascii', errors='replace') for code in codes]
+            too_long = [code for code, raw in zip(codes, encoded) if len(raw) > self.codes.itemsize or not code.isascii()]
+            if too_long:
+                raise ValueError(f"currency codes must be at most {self.codes.itemsize} ASCII characters: {too_long}")
+        header = self.header
+
+        header[SEQUENCE] += 1  # Odd: readers retry until the write is done
+        if changed:
+            self._codes = list(codes)
+            self.codes[:n] = encoded
+            header[CODES] += 1
+        self.rates[:n, :n] = rates
+        header[COUNT] = n
+        header[VERSION] = header[VERSION] + 1 if version is None else version
+        header[TIMESTAMP] = time.time_ns() if timestamp is None else int(timestamp * 1e9)
+        header[SEQUENCE] += 1
+
+    def publish_snapshot(self, snapshot):
+        """
+        Write a Snapshot from a SnapshotHolder, keeping its version.
+        """
+        self.publish(snapshot.codes, snapshot.rates, snapshot.version, snapshot.timestamp)
+
+    def close(self):
+        """
+        Remove the segment. Subscribers that are still attached keep their mapping until they close.
+        """
+        self.shm.close()
+        self.shm.unlink()
+        _published.discard(self.shm._name)
+
+
+class RateSubscriber:
+    """
+    Read the snapshots of a RatePublisher from another process, without fetching or unpickling anything.
+
+    Args:
+        name (str): Name of the segment.
+    """
+    def __init__(self, name):
+        self.shm = shared_memory.SharedMemory(name=name)
+        # The publisher owns the segment; without this the resource tracker would remove it when we exit
+        if self.shm._name not in _published:
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+        capacity = int(np.ndarray((6,), dtype=np.int64, buffer=self.shm.buf)[CAPACITY])
+        self.header, self.codes, self.rates = map_segment(self.shm.buf, capacity)
+        self._local = np.empty((capacity, capacity))
+        self._codes_generation = -1
+        self._codes = []
+
+    @property
+    def version(self):
+        """
+        Version of the latest complete snapshot, or 0 if nothing was published yet.
+        """
+        return int(self.header[VERSION])
+
+    def read(self, consumer=None):
+        """
+        Read one consistent snapshot.
+
+        Without a consumer the rates are copied into a buffer owned by the subscriber, which the next
+        read overwrites. With one, consumer(codes, rates) runs directly on the shared matrix and is
+        run again if the publisher wrote in the meantime, so it must not have side effects.
+
+        Returns:
+            tuple: (version, codes, rates or the consumer's result).
+        """
+        header = self.header
+        while True:
+            sequence = int(header[SEQUENCE])
+            if sequence & 1:
+                continue  # A write is in progress
+
+            n = int(header[COUNT])
+            version = int(header[VERSION])
+            if header[CODES] != self._codes_generation:
+                self._codes_generation = int(header[CODES])
+                self._codes = [code.decode('ascii') for code in self.codes[:n].tolist()]
+            codes = self._codes[:n]
+
+            if consumer is None:
+                result = self._local[:n, :n]
+                np.copyto(result, self.rates[:n, :n])
+            else:
+                result = consumer(codes, self.rates[:n, :n])
+
+            if int(header[SEQUENCE]) == sequence:
+                return version, codes, result
+            self._codes_generation = -1  # The codes may have been read mid-write too
+
+    def wait(self, since, timeout=None, poll_interval=1e-4):
+        """
+        Wait until a snapshot newer than version 'since' is published.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.version <= since:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(poll_interval)
+        return True
+
+    def fetch_exchange_rates(self, currencies, exchange_rates, fallback=None):
+        """
+        Same contract as ExchangeCore.fetch_exchange_rates, served from the shared segment.
+
+        Currencies the publisher doesn't track are reported. If a fallback fetch is given, such as
+        ExchangeCore.fetch_exchange_rates, all the currencies are fetched with it instead, since every
+        row needs the rates to the missing ones.
+
+        Returns:
+            int: Version of the snapshot the rates came from, None if they came from the fallback.
+        """
+        version, codes, rates = self.read()
+        index = {code: i for i, code in enumerate(codes)}
+        missing = [currency for currency in currencies if currency not in index]
+        if missing:
+            print(f"Not in the shared rates: {', '.join(missing)}")
+            if fallback is not None:
+                fallback(currencies, exchange_rates)
+                return None
+        for base in currencies:
+            i = index.get(base)
+            if i is not None:
+                exchange_rates[base] = {currency: float(rates[i, index[currency]]) for currency in currencies
+                                        if currency != base and currency in index and rates[i, index[currency]] > 0}
+        return version
+
+    def close(self):
+        self.shm.close()
+
+
+def _subscribe(name, reads, results):
+    # Subscriber process of the example below: check that every read is one whole snapshot
+    subscriber = RateSubscriber(name)
+    torn, latencies, version = 0, [], 0
+    start = time.perf_counter()
+    for _ in range(reads):
+        subscriber.wait(version)
+        version, codes, rates = subscriber.read()
+        latencies.append(time.time_ns() - int(subscriber.header[TIMESTAMP]))
+        torn += not (rates == version).all()
+    elapsed = time.perf_counter() - start
+    subscriber.close()
+    results.put((torn, elapsed / reads, float(np.median(latencies)) / 1000))
+
+
+# Example usage: one publisher, several reader processes
+if __name__ == "__main__":
+    import multiprocessing
+
+    n = 150
+    codes = [f"C{i:03d}" for i in range(n)]
+    publisher = RatePublisher(f"rates-example-{multiprocessing.current_process().pid}", capacity=n)
+    publisher.publish(codes, np.zeros((n, n)), version=0)
+
+    results = multiprocessing.Queue()
+    readers = [multiprocessing.Process(target=_subscribe, args=(publisher.name, 2000, results)) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+
+    matrix = np.empty((n, n))
+    version = 0
+    start = time.perf_counter()
+    while any(reader.is_alive() for reader in readers):
+        version += 1
+        matrix.fill(version)  # Every rate of snapshot v is v
+        publisher.publish(codes, matrix, version=version)
+        time.sleep(0.0005)
+    publish_time = (time.perf_counter() - start) / version
+
+    for reader in readers:
+        reader.join()
+        torn, read_time, latency = results.get()
+        print(f"Reader: {torn} torn reads, {read_time * 1e6:.0f} us per read including the wait, "
+              f"median {latency:.0f} us from publish to read")
+    print(f"{version} snapshots of {n}x{n} published, {publish_time * 1e6:.0f} us apart")
+
+    # Reading alone, copied into the subscriber's buffer or used in place
+    subscriber = RateSubscriber(publisher.name)
+    for consumer in (None, lambda codes, rates: float(rates.max())):
+        start = time.perf_counter()
+        for _ in range(10000):
+            subscriber.read(consumer)
+        print(f"read({'consumer' if consumer else ''}): {(time.perf_counter() - start) / 10000 * 1e6:.1f} us")
+
+    # The same rates through the nested dictionary contract
+    exchange_rates = {}
+    print(f"Version {subscriber.fetch_exchange_rates(codes[:3], exchange_rates)}: {exchange_rates}")
+    subscriber.close()
+    publisher.close()
@@ -0,0 +1,144 @@
+import threading
+import time
+
+from RateBook import RateBook
+
+
+class Snapshot:
+    """
+    A complete, read-only set of rates and the version it was published as.
+
+    Args:
+        version (int): Publication number, increasing by one per snapshot.
+        book (RateBook): The rates, frozen.
+        timestamp (float): When the snapshot was published.
+    """
+    __slots__ = ('version', 'book', 'timestamp')
+
+    def __init__(self, version, book, timestamp):
+        self.version = version
+        self.book = book
+        self.timestamp = timestamp
+
+    @property
+    def codes(self):
+        return self.book.codes
+
+    @property
+    def rates(self):
+        return self.book.rates
+
+    @property
+    def view(self):
+        # Nested dictionary view for the dictionary based code
+        return self.book.view
+
+    def __repr__(self):
+        return f"Snapshot(version={self.version}, {self.book!r})"
+
+
+class SnapshotHolder:
+    """
+    The current rate snapshot, replaced as a whole so readers never see a half-updated one.
+
+    A writer takes a draft (a writable copy of the current rates), fills it at its own pace, and publishes
+    it: the draft is frozen and becomes current with a single reference assignment. Readers just read
+    holder.current once and keep using that snapshot; they take no lock, and a snapshot never changes
+    after it is published. Writers are serialized by a lock so versions are handed out in order.
+
+    Args:
+        codes (list): Currencies of the initial, empty snapshot (version 0).
+    """
+    def __init__(self, codes=()):
+        self._publish_lock = threading.Lock()
+        self.current = Snapshot(0, RateBook(codes).freeze(), None)
+
+    def draft(self, codes=None):
+        """
+        A writable copy of the current rates to build the next snapshot in.
+
+        Args:
+            codes (list): Currencies of the next snapshot, defaults to the current ones. Rates of currencies
+                          that stay are carried over, so a partial fetch keeps the last known values.
+        """
+        book = self.current.book.copy()
+        if codes is not None:
+            book.set_codes(codes)
+        return book
+
+    def publish(self, book, timestamp=None):
+        """
+        Make a finished draft the current snapshot. The book must not be changed afterwards.
+
+        Returns:
+            Snapshot: The published snapshot.
+        """
+        book.freeze()
+        with self._publish_lock:
+            snapshot = Snapshot(self.current.version + 1, book, time.time() if timestamp is None else timestamp)
+            self.current = snapshot  # The swap: one reference assignment
+        return snapshot
+
+
+# Example usage: readers on other threads while a writer publishes as fast as it can
+if __name__ == "__main__":
+    import numpy as np
+
+    codes = [f"C{i:02d}" for i in range(40)]
+    holder = SnapshotHolder(codes)
+    stop = threading.Event()
+
+    def write_snapshots():
+        # Every rate of snapshot v is v, written one base at a time like fetch_exchange_rates
+        while not stop.is_set():
+            draft = holder.draft()
+            value = holder.current.version + 1
+            for base in codes:
+                draft[base] = {currency: value for currency in codes}
+            holder.publish(draft)
+
+    shared = {base: {} for base in codes}  # The old way: one dictionary updated in place
+
+    def write_shared():
+        value = 0
+        while not stop.is_set():
+            value += 1
+            for base in codes:
+                shared[base] = {currency: value for currency in codes if currency != base}
+
+    torn = {'snapshot': 0, 'shared dict': 0}
+    reads = {'snapshot': 0, 'shared dict': 0}
+
+    def read_snapshots():
+        last = 0
+        while not stop.is_set():
+            snapshot = holder.current
+            assert snapshot.version >= last
+            last = snapshot.version
+            rates = snapshot.rates[np.isfinite(snapshot.rates)]
+            torn['snapshot'] += bool(len(rates)) and (rates.min() != rates.max() or rates[0] != snapshot.version)
+            reads['snapshot'] += 1
+
+    def read_shared():
+        while not stop.is_set():
+            values = {rate for base in codes for rate in shared[base].values()}
+            torn['shared dict'] += len(values) > 1
+            reads['shared dict'] += 1
+
+    threads = [threading.Thread(target=target) for target in (write_snapshots, write_shared, read_snapshots, read_shared)]
+    for thread in threads:
+        thread.start()
+    time.sleep(2.0)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"{holder.current.version} snapshots published")
+    for kind in torn:
+        print(f"{kind}: {torn[kind]} of {reads[kind]} reads saw rates from two different updates")
+    assert torn['snapshot'] == 0
+
+    start = time.perf_counter()
+    for _ in range(1000000):
+        holder.current
+    print(f"Taking the current snapshot: {(time.perf_counter() - start) * 1000:.0f} ns per read")